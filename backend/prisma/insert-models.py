@@ -1,8 +1,20 @@
 #!/usr/bin/env python3
 """
 Script to insert new Prisma models into schema.prisma after the Prescriber model
+(or at the end of the file when there is no Prescriber model)
+Models already in the schema are skipped, and the write goes through schema_edit so
+concurrent edits are merged instead of overwritten.
 """
 
+import argparse
+import os
+import sys
+
+# Shared tooling helpers live in the repo's scripts/ directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+import tool_metrics
+from schema_edit import SchemaEditError, add_blocks, edit_schema, find_block
+
 NEW_MODELS = """
 model PrescriptionVersion {
   id                String   @id @default(cuid())
@@ -126,24 +138,45 @@ model PrescriptionFile {
 }
 """
 
-def main():
-    schema_path = 'schema.prisma'
-    
-    # Read the file
-    with open(schema_path, 'r') as f:
-        lines = f.readlines()
-    
-    # Find the line number after Prescriber model (line 1056 is the closing brace)
-    insert_after_line = 1056
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Insert the new prescription models into schema.prisma")
+    parser.add_argument('--schema', default=os.environ.get('HOPERX_SCHEMA_PATH', 'schema.prisma'),
+                        help="Path to schema.prisma (default: $HOPERX_SCHEMA_PATH or ./schema.prisma)")
+    tool_metrics.add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+def insert_models(schema_path):
+    added = []
+    anchor = []
     
-    # Insert the new models
-    lines.insert(insert_after_line, NEW_MODELS)
+    def edit(text):
+        # Next to Prescriber when the schema has it, otherwise at the end of the file
+        after = ('model', 'Prescriber') if find_block(text, 'model', 'Prescriber') else None
+        text, names = add_blocks(text, NEW_MODELS, after=after)
+        added.extend(names)
+        anchor.append('after the Prescriber model' if after else 'at the end of the schema')
+        tool_metrics.count('models', len(names))
+        return text
     
-    # Write back
-    with open(schema_path, 'w') as f:
-        f.writelines(lines)
+    try:
+        edit_schema(schema_path, edit)
+    except SchemaEditError as e:
+        print(f"❌ {e}")
+        return 1
     
-    print(f"✅ Successfully inserted new models after line {insert_after_line}")
+    if not added:
+        print("No new models to insert!")
+        return 0
+    print(f"✅ Successfully inserted {', '.join(added)} {anchor[-1]}")
+    return 0
+
+def main(argv=None):
+    args = parse_args(argv)
+    tool_metrics.start_run('insert-models', args)
+    try:
+        return insert_models(args.schema)
+    finally:
+        tool_metrics.finish_run(args)
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -1,58 +1,55 @@
 #!/usr/bin/env python3
 """
 Script to remove duplicate PrescriptionFile model from schema.prisma
-Keep the first occurrence (line 1163) and remove the second (line 2870)
+Keeps the first occurrence and removes the later ones, writing through schema_edit so
+concurrent edits are merged instead of overwritten.
 """
 
-def main():
-    schema_path = 'schema.prisma'
-    
-    # Read the file
-    with open(schema_path, 'r') as f:
-        content = f.read()
-    
-    # Split into lines
-    lines = content.split('\n')
-    
-    # Find both PrescriptionFile model locations
-    prescriptions_file_starts = []
-    for i, line in enumerate(lines, 1):
-        if line.strip() == 'model PrescriptionFile {':
-            prescriptions_file_starts.append(i-1)  # 0-indexed
-    
-    print(f"Found Prescription File models at lines: {[i+1 for i in prescriptions_file_starts]}")
-    
-    if len(prescriptions_file_starts) < 2:
+import argparse
+import os
+import sys
+
+# Shared tooling helpers live in the repo's scripts/ directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts'))
+import tool_metrics
+from schema_edit import SchemaEditError, edit_schema, remove_blocks
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Remove the duplicate PrescriptionFile model from schema.prisma")
+    parser.add_argument('--schema', default=os.environ.get('HOPERX_SCHEMA_PATH', 'schema.prisma'),
+                        help="Path to schema.prisma (default: $HOPERX_SCHEMA_PATH or ./schema.prisma)")
+    tool_metrics.add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+def remove_duplicate(schema_path):
+    removed = []
+    
+    def edit(text):
+        text, lines = remove_blocks(text, 'model', 'PrescriptionFile', keep_first=True)
+        removed.extend(lines)
+        tool_metrics.count('blocks', len(lines))
+        return text
+    
+    try:
+        edit_schema(schema_path, edit)
+    except SchemaEditError as e:
+        print(f"❌ {e}")
+        return 1
+    
+    if not removed:
         print("No duplicate found!")
-        return
-    
-    # Remove the second occurrence (around line 2870)
-    # We'll find the closing brace for the second model
-    start_idx = prescriptions_file_starts[1]
-    end_idx = start_idx
-    
-    # Find the closing brace
-    brace_count = 0
-    for i in range(start_idx, len(lines)):
-        line = lines[i].strip()
-        if '{' in line:
-            brace_count += line.count('{')
-        if '}' in line:
-            brace_count -= line.count('}')
-        if brace_count == 0:
-            end_idx = i
-            break
-    
-    print(f"Removing lines {start_idx+1} to {end_idx+1}")
-    
-    # Remove the duplicate
-    del lines[start_idx:end_idx+2]  # +2 to include closing brace and blank line
-    
-    # Write back
-    with open(schema_path, 'w') as f:
-        f.write('\n'.join(lines))
-    
+        return 0
+    print(f"Removed PrescriptionFile models starting at lines: {removed}")
     print("✅ Successfully removed duplicate PrescriptionFile model")
+    return 0
+
+def main(argv=None):
+    args = parse_args(argv)
+    tool_metrics.start_run('remove-duplicate', args)
+    try:
+        return remove_duplicate(args.schema)
+    finally:
+        tool_metrics.finish_run(args)
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
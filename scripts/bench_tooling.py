@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Tooling Benchmarks
+Times the schema editing scripts, route extraction/categorisation and workbook
+generation on synthetic inputs scaled from today's sizes (156 models, 176 routes,
+1,000-row sheets). Each case runs in a fresh process so peak RSS is per case.
+Results can be saved as a JSON baseline and later runs fail on regressions.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from tools_config import REPO_ROOT, load_config
+
+BASE_MODELS = 156
+BASE_ROUTES = 176
+BASE_SHEET_ROWS = 1000
+
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_REPEATS = 3
+
+
+class BenchCaseError(RuntimeError):
+    pass
+
+# Changes smaller than these are timer/allocator noise, whatever the percentage
+MIN_REGRESSION_DELTA = {'seconds': 0.01, 'peak_rss_mb': 2.0}
+
+ROUTE_GROUPS = ['(auth)', '(main)', '(dashboard)', '']
+ROUTE_SECTIONS = [
+    'dashboard', 'pos', 'inventory', 'orders', 'dispense', 'patients', 'prescriptions',
+    'finance', 'gst', 'claims', 'insights', 'reports', 'messages', 'settings', 'audit',
+]
+
+
+# ======================
+# SYNTHETIC INPUTS
+# ======================
+
+def synthetic_model(index, name=None):
+    """One model block shaped like the real ones: scalars, a relation and indexes"""
+    name = name or f"Model{index}"
+    lines = [
+        f"model {name} {{",
+        "  id          String    @id @default(cuid())",
+        "  storeId     String",
+        "  code        String    @unique",
+        "  name        String",
+        "  quantity    Int       @default(0)",
+        "  amount      Decimal   @default(0) @db.Decimal(10, 2)",
+        f"  status      Enum{index // 3}  @default(A)",
+        "  notes       String?   @db.Text",
+        "  attachments Json?",
+        "  createdAt   DateTime  @default(now())",
+        "  updatedAt   DateTime  @updatedAt",
+    ]
+    if index > 0:
+        lines += [
+            "  parentId    String?",
+            f"  parent      Model{index - 1}? @relation(fields: [parentId], references: [id])",
+        ]
+    lines += [
+        "",
+        "  @@index([storeId, createdAt])",
+        "  @@index([status])",
+    ]
+    if index % 3 == 0:
+        lines.append("  @@index([storeId, status])")
+    lines.append("}")
+    return '\n'.join(lines)
+
+
+def synthetic_enum(index):
+    return f"enum Enum{index} {{\n  A\n  B\n  C\n}}"
+
+
+def generate_schema(model_count, duplicate_model=None):
+    """Schema text with model_count models and one enum per three models.
+
+    duplicate_model inserts the named model twice (near the top and at the end),
+    as happened with PrescriptionFile.
+    """
+    blocks = [
+        'generator client {\n  provider = "prisma-client-js"\n}',
+        'datasource db {\n  provider = "postgresql"\n  url      = env("DATABASE_URL")\n}',
+    ]
+    for i in range(model_count):
+        blocks.append(synthetic_model(i))
+        if duplicate_model and i == min(10, model_count - 1):
+            blocks.append(synthetic_model(i, name=duplicate_model))
+        if i % 3 == 0:
+            blocks.append(synthetic_enum(i // 3))
+    if duplicate_model:
+        blocks.append(synthetic_model(model_count - 1, name=duplicate_model))
+    return '\n\n'.join(blocks) + '\n'
+
+
+def generate_app_directory(app_dir, route_count):
+    """Create route_count page.tsx files spread over route groups and sections"""
+    for i in range(route_count):
+        group = ROUTE_GROUPS[i % len(ROUTE_GROUPS)]
+        section = ROUTE_SECTIONS[i % len(ROUTE_SECTIONS)]
+        parts = [p for p in (group, section, f"page-{i // len(ROUTE_SECTIONS)}") if p]
+        if i % 4 == 0:
+            parts.append('details')
+        page_dir = os.path.join(app_dir, *parts)
+        os.makedirs(page_dir, exist_ok=True)
+        with open(os.path.join(page_dir, 'page.tsx'), 'w') as f:
+            f.write('export default function Page() { return null }\n')
+        # Non-page siblings the walker has to skip
+        with open(os.path.join(page_dir, 'loading.tsx'), 'w') as f:
+            f.write('export default function Loading() { return null }\n')
+
+
+def generate_routes(route_count):
+    return [f"/{ROUTE_SECTIONS[i % len(ROUTE_SECTIONS)]}/page-{i}" for i in range(route_count)]
+
+
+def prepare_inputs(work_dir, scale):
+    """Write every case's inputs for one scale; generation is never timed"""
+    inputs = {
+        'schema': os.path.join(work_dir, 'schema.prisma'),
+        'schema_with_duplicate': os.path.join(work_dir, 'schema_with_duplicate.prisma'),
+        'app_dir': os.path.join(work_dir, 'app'),
+        'sheet_rows': BASE_SHEET_ROWS * scale,
+    }
+    model_count = BASE_MODELS * scale
+    with open(inputs['schema'], 'w') as f:
+        f.write(generate_schema(model_count))
+    with open(inputs['schema_with_duplicate'], 'w') as f:
+        f.write(generate_schema(model_count, duplicate_model='PrescriptionFile'))
+    generate_app_directory(inputs['app_dir'], BASE_ROUTES * scale)
+    return inputs
+
+
+# ======================
+# CASES
+# ======================
+
+def load_schema_script(name):
+    import importlib.util
+    path = os.path.join(REPO_ROOT, 'backend', 'prisma', name)
+    spec = importlib.util.spec_from_file_location(name.replace('-', '_')[:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def case_schema_insert(inputs, scratch):
+    """insert-models.py: read, splice the new models in, write back"""
+    module = load_schema_script('insert-models.py')
+    target = os.path.join(scratch, 'schema.prisma')
+    shutil.copyfile(inputs['schema'], target)
+    return lambda: module.main(['--schema', target])
+
+
+def case_schema_remove_duplicate(inputs, scratch):
+    """remove-duplicate.py: find both PrescriptionFile blocks, drop the second"""
+    module = load_schema_script('remove-duplicate.py')
+    target = os.path.join(scratch, 'schema.prisma')
+    shutil.copyfile(inputs['schema_with_duplicate'], target)
+    return lambda: module.main(['--schema', target])
+
+
+def case_routes(inputs, scratch):
+    """Walk the app directory, order routes by workflow and categorise them"""
+    from generate_route_tracker import (
+        extract_routes_from_app_directory,
+        categorize_and_order_routes,
+        determine_feature_category,
+    )
+
+    def run():
+        routes = extract_routes_from_app_directory(inputs['app_dir'])
+        ordered = categorize_and_order_routes(routes)
+        return [determine_feature_category(route) for route in ordered]
+    return run
+
+
+def case_workbook(inputs, scratch):
+    """create_master_tracker with a Feature Master of sheet_rows routes"""
+    from generate_excel_tracker import create_master_tracker
+    routes = generate_routes(inputs['sheet_rows'])
+    output_path = os.path.join(scratch, 'tracker.xlsx')
+    return lambda: create_master_tracker(output_path, routes)
+
+
+# Case name -> (setup function returning the timed callable, required module)
+CASES = {
+    'schema_insert': (case_schema_insert, None),
+    'schema_remove_duplicate': (case_schema_remove_duplicate, None),
+    'routes': (case_routes, None),
+    'workbook': (case_workbook, 'openpyxl'),
+}
+
+
+def peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(case_name, inputs, repeats):
+    """Run one case in this (fresh) process; returns best time and peak RSS
+
+    Raises BenchCaseError when the case raises or a script returns a nonzero exit code,
+    so a failing path is never reported as a timing.
+    """
+    setup, _ = CASES[case_name]
+    timings = []
+    for _ in range(repeats):
+        scratch = tempfile.mkdtemp(prefix='hoperx-bench-')
+        output = io.StringIO()
+        try:
+            run = setup(inputs, scratch)
+            with contextlib.redirect_stdout(output):
+                start = time.perf_counter()
+                result = run()
+                timings.append(time.perf_counter() - start)
+        except Exception as e:
+            raise BenchCaseError(f"{type(e).__name__}: {e}")
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        # Script cases return main()'s exit code; other cases return data
+        if isinstance(result, int) and not isinstance(result, bool) and result != 0:
+            last_line = output.getvalue().strip().splitlines()[-1:] or ['no output']
+            raise BenchCaseError(f"exited with {result}: {last_line[0]}")
+    return {'seconds': min(timings), 'peak_rss_mb': round(peak_rss_mb(), 1)}
+
+
+def run_isolated(case_name, inputs, repeats):
+    """Run a case in a freshly spawned interpreter so RSS isn't shared between cases"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_case, case_name, inputs, repeats).result()
+
+
+def module_available(name):
+    import importlib.util
+    return name is None or importlib.util.find_spec(name) is not None
+
+
+def run_benchmarks(cases, scales, repeats):
+    """Returns (results, failures) where failures maps case key -> error message"""
+    results, failures = {}, {}
+    for scale in scales:
+        work_dir = tempfile.mkdtemp(prefix=f'hoperx-bench-{scale}x-')
+        try:
+            inputs = prepare_inputs(work_dir, scale)
+            for case_name in cases:
+                key = f"{case_name}@{scale}x"
+                if not module_available(CASES[case_name][1]):
+                    print(f"⏭️  {key}: skipped ({CASES[case_name][1]} not installed)")
+                    continue
+                try:
+                    results[key] = run_isolated(case_name, inputs, repeats)
+                except BenchCaseError as e:
+                    failures[key] = str(e)
+                    print(f"❌ {key}: failed ({e})")
+                    continue
+                print(f"⏱️  {key}: {results[key]['seconds'] * 1000:.1f} ms, "
+                      f"peak RSS {results[key]['peak_rss_mb']:.1f} MB")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return results, failures
+
+
+# ======================
+# BASELINES
+# ======================
+
+def save_baseline(results, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    baseline = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def find_regressions(results, baseline, time_threshold, rss_threshold):
+    """Cases whose time or peak RSS grew past the thresholds (fractions, e.g. 0.25)"""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get('results', {}).get(key)
+        if previous is None:
+            continue
+        for metric, threshold in (('seconds', time_threshold), ('peak_rss_mb', rss_threshold)):
+            grew_past_threshold = current[metric] > previous[metric] * (1 + threshold)
+            grew_past_noise = current[metric] - previous[metric] > MIN_REGRESSION_DELTA[metric]
+            if previous[metric] and grew_past_threshold and grew_past_noise:
+                change = (current[metric] / previous[metric] - 1) * 100
+                regressions.append(
+                    f"{key} {metric}: {previous[metric]:.3f} -> {current[metric]:.3f} (+{change:.0f}%)"
+                )
+    return regressions
+
+
+def parse_args(argv=None):
+    config = load_config()
+    parser = argparse.ArgumentParser(description="Benchmark the schema, route and workbook tooling")
+    parser.add_argument('--case', action='append', choices=sorted(CASES), default=[],
+                        help="Case to run (repeatable, default: all)")
+    parser.add_argument('--scale', action='append', type=int, default=[],
+                        help="Input scale multiplier (repeatable, default: 1, 10, 100)")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help="Timed runs per case; the fastest is kept")
+    parser.add_argument('--baseline', default=config['bench_baseline_path'],
+                        help="Baseline JSON to compare against / save to")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Write this run's results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed time regression as a fraction (default: 0.25)")
+    parser.add_argument('--rss-threshold', type=float, default=0.25,
+                        help="Allowed peak RSS regression as a fraction (default: 0.25)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = args.case or list(CASES)
+    scales = args.scale or DEFAULT_SCALES
+
+    print(f"🏁 Benchmarking {len(cases)} cases at scales {', '.join(f'{s}x' for s in scales)}...")
+    results, failures = run_benchmarks(cases, scales, args.repeats)
+
+    if failures:
+        print(f"❌ {len(failures)} case(s) failed; no timings compared or saved")
+        return 1
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"✅ Baseline saved: {args.baseline}")
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print(f"ℹ️  No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = find_regressions(results, baseline, args.threshold, args.rss_threshold)
+    if regressions:
+        print("❌ Regressions against baseline:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+
+    print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,634 @@
+#!/usr/bin/env python3
+"""
+Fixture Bulk Loader
+Loads JSON/CSV fixtures for schema.prisma models into a local Postgres with COPY,
+replacing per-row Prisma creates in the seed and dummy-data scripts.
+
+Every fixture is validated in memory before anything is written: types and enum
+values, required fields, @id/@unique/@@unique duplicates and relation references
+(against the other fixtures, or the rows already in the database). Models are then
+loaded parents-first in a single transaction of batched COPY statements.
+
+The target's foreign keys are read from pg_constraint before loading. When the loaded
+tables have any, the transaction runs with session_replication_role = replica so FK
+triggers don't fire (references were validated above, and relation cycles can load);
+that setting needs a superuser, as the local development database has. --truncate
+empties every loaded table in one TRUNCATE; if tables outside the fixtures reference
+them it stops unless --cascade is given, which empties those tables as well.
+
+Fixture files are named after the model or its table: Drug.json, InventoryBatch.csv,
+po_attachments.csv.gz. A JSON file may also map model names to row lists.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import secrets
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+
+from local_postgres import DatabaseUrl, PostgresError, run_psql, stream_psql
+from prisma_ddl import quote_identifier
+from prisma_schema import load_schema
+from tools_config import load_config
+import tool_metrics
+
+DEFAULT_BATCH_SIZE = 5000
+MAX_ERRORS_SHOWN = 20
+FIXTURE_EXTENSIONS = ('.json', '.csv', '.json.gz', '.csv.gz')
+TRUE_VALUES = {'true', 't', '1', 'yes', 'y'}
+FALSE_VALUES = {'false', 'f', '0', 'no', 'n'}
+BASE36 = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+_cuid_counter = 0
+
+
+# ======================
+# FIXTURES
+# ======================
+
+def fixture_stem(path):
+    name = os.path.basename(path)
+    for extension in FIXTURE_EXTENSIONS:
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return None
+
+
+def open_fixture(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def is_csv(path):
+    return '.csv' in os.path.basename(path)
+
+
+def read_fixture(path):
+    """{stem or model name: [row dicts]} from one fixture file"""
+    with open_fixture(path) as handle:
+        if is_csv(path):
+            import csv
+            csv.field_size_limit(sys.maxsize)
+            return {fixture_stem(path): list(csv.DictReader(handle))}
+        data = json.load(handle)
+    if isinstance(data, dict):
+        return data
+    return {fixture_stem(path): data}
+
+
+def decode_csv_rows(model, rows):
+    """CSV cells carry Json and list columns as serialised JSON"""
+    encoded = {f.column for f in model.fields if f.type == 'Json' or f.is_list}
+    encoded |= {f.name for f in model.fields if f.type == 'Json' or f.is_list}
+    for number, row in enumerate(rows, 1):
+        for key in encoded & row.keys():
+            if row[key]:
+                try:
+                    row[key] = json.loads(row[key])
+                except ValueError as e:
+                    raise ValueError(f"{model.name} row {number}: {key} is not valid JSON ({e})")
+    return rows
+
+
+def fixture_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, name) for name in os.listdir(path) if fixture_stem(name))
+        else:
+            files.append(path)
+    return files
+
+
+def read_fixtures(paths, schema):
+    """Model name -> rows, resolving file stems through model names and @@map table names"""
+    fixtures = {}
+    for path in fixture_files(paths):
+        tool_metrics.count('files')
+        for stem, rows in read_fixture(path).items():
+            model = schema.models.get(stem) or schema.model_for_table(stem)
+            if model is None:
+                raise ValueError(f"{path}: no model or table named {stem!r}")
+            if is_csv(path):
+                rows = decode_csv_rows(model, rows)
+            fixtures.setdefault(model.name, []).extend(rows)
+            tool_metrics.count('rows', len(rows))
+    return fixtures
+
+
+# ======================
+# LOAD ORDER
+# ======================
+
+def parent_models(model, schema):
+    """Models this one points at through its own FK fields"""
+    return {relation.type for relation in schema.relation_fields(model)
+            if relation.relation_fields and relation.type != model.name}
+
+
+def parent_cycle(pending):
+    """Models of one relation cycle whose parents all lie inside it (Tarjan's SCC over child -> parent)
+
+    Called when no model is ready, so every model still has a pending parent; the first strongly
+    connected component Tarjan completes has no parents outside itself and is therefore a real cycle.
+    """
+    index, lowlink, stack, on_stack = {}, {}, [], set()
+
+    def visit(name):
+        index[name] = lowlink[name] = len(index)
+        stack.append(name)
+        on_stack.add(name)
+        for parent in sorted(pending[name]):
+            if parent not in index:
+                found = visit(parent)
+                if found:
+                    return found
+                lowlink[name] = min(lowlink[name], lowlink[parent])
+            elif parent in on_stack:
+                lowlink[name] = min(lowlink[name], index[parent])
+        if lowlink[name] != index[name]:
+            return None
+        component = []
+        while True:
+            member = stack.pop()
+            on_stack.discard(member)
+            component.append(member)
+            if member == name:
+                return sorted(component)
+
+    for name in sorted(pending):
+        if name not in index:
+            found = visit(name)
+            if found:
+                return found
+    return []
+
+
+def load_order(names, schema):
+    """Parents before children; a relation cycle is broken at the alphabetically first model in it"""
+    pending = {name: parent_models(schema.models[name], schema) & set(names) for name in names}
+    order, cycles = [], []
+    while pending:
+        ready = sorted(name for name, parents in pending.items() if not parents)
+        if not ready:
+            cycle = parent_cycle(pending)
+            ready = cycle[:1]
+            cycles.append(cycle)
+        for name in ready:
+            order.append(name)
+            del pending[name]
+        for parents in pending.values():
+            parents.difference_update(ready)
+    return order, cycles
+
+
+# ======================
+# VALIDATION
+# ======================
+
+def new_cuid():
+    """Collision-resistant id in the shape of Prisma's cuid(): c + time + counter + random"""
+    global _cuid_counter
+    _cuid_counter = (_cuid_counter + 1) % 36 ** 4
+
+    def base36(number, width):
+        digits = ''
+        while number:
+            number, digit = divmod(number, 36)
+            digits = BASE36[digit] + digits
+        return digits.rjust(width, '0')[-width:]
+
+    return ('c' + base36(int(time.time() * 1000), 8) + base36(_cuid_counter, 4)
+            + base36(secrets.randbits(41), 8) + base36(secrets.randbits(21), 4))
+
+
+def static_default(field, now):
+    """Fixture-independent value Prisma would fill in for a missing field, or None"""
+    default = (field.default or '').strip()
+    if default == 'now()' or '@updatedAt' in field.attributes:
+        return now
+    if not default or default.endswith(')'):
+        return None
+    if field.is_list:
+        return [item.strip().strip('"') for item in default[1:-1].split(',') if item.strip()]
+    return default.strip('"') if default.startswith('"') else default
+
+
+def fill_plan(model, schema, now):
+    """(field, factory) for every field a row may omit; factory is None for required fields"""
+    plan = []
+    for field in schema.scalar_fields(model):
+        default = (field.default or '').strip()
+        if database_defaulted(field):
+            continue
+        if default.startswith('cuid('):
+            plan.append((field, new_cuid))
+        elif default.startswith('uuid('):
+            plan.append((field, lambda: str(uuid.uuid4())))
+        else:
+            value = static_default(field, now)
+            if value is not None:
+                value = coerce(field, value, schema)
+                plan.append((field, lambda value=value: value))
+            elif not field.optional and not field.is_list:
+                plan.append((field, None))
+    return plan
+
+
+def database_defaulted(field):
+    """Fields whose default the database computes (autoincrement, dbgenerated)"""
+    default = (field.default or '').strip()
+    return default == 'autoincrement()' or default.startswith('dbgenerated(')
+
+
+def coerce(field, value, schema):
+    """Canonical Python value for a fixture value, raising ValueError when it doesn't fit the type"""
+    if field.is_list:
+        if not isinstance(value, list):
+            raise ValueError(f"expected a list, got {value!r}")
+        return [None if item is None else coerce_scalar(field, item, schema) for item in value]
+    return coerce_scalar(field, value, schema)
+
+
+def coerce_scalar(field, value, schema):
+    if field.type in schema.enums:
+        if value not in schema.enums[field.type].values:
+            raise ValueError(f"{value!r} is not a {field.type} value")
+        return value
+    if field.type in ('Int', 'BigInt'):
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError(f"expected an integer, got {value!r}")
+        return int(value)
+    if field.type == 'Float':
+        return float(value)
+    if field.type == 'Decimal':
+        try:
+            return Decimal(str(value))
+        except InvalidOperation:
+            raise ValueError(f"expected a decimal, got {value!r}")
+    if field.type == 'Boolean':
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in TRUE_VALUES | FALSE_VALUES:
+            return text in TRUE_VALUES
+        raise ValueError(f"expected a boolean, got {value!r}")
+    if field.type == 'DateTime':
+        if isinstance(value, (int, float)):
+            moment = datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+        else:
+            moment = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        # Prisma keeps UTC in timestamp(3) columns, which would silently drop an offset
+        if moment.tzinfo and field.native_type != 'Timestamptz':
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment.isoformat()
+    if field.type == 'Json':
+        return value
+    return str(value)
+
+
+def normalise_rows(model, rows, schema, now):
+    """Rows keyed by field name with defaults filled and values coerced, plus error messages"""
+    by_key = {}
+    for field in schema.scalar_fields(model):
+        by_key[field.name] = field
+        by_key[field.column] = field
+
+    plan = fill_plan(model, schema, now)
+    errors, normalised = [], []
+    for number, raw in enumerate(rows, 1):
+        row = {}
+        for key, value in raw.items():
+            field = by_key.get(key)
+            if field is None:
+                errors.append(f"row {number}: unknown field {key!r}")
+                continue
+            if value is None or (value == '' and (field.optional or field.type != 'String')):
+                row[field.name] = None
+                continue
+            try:
+                row[field.name] = coerce(field, value, schema)
+            except (ValueError, TypeError) as e:
+                errors.append(f"row {number}: {field.name}: {e}")
+
+        for field, factory in plan:
+            if row.get(field.name) is not None:
+                continue
+            if factory is None:
+                errors.append(f"row {number}: {field.name} is required")
+            else:
+                row[field.name] = factory()
+        normalised.append(row)
+    return normalised, errors
+
+
+def key_text(value):
+    return None if value is None else copy_text(value)
+
+
+def check_unique(model, rows):
+    errors = []
+    for index in model.indexes:
+        if index.kind not in ('id', 'unique'):
+            continue
+        seen = {}
+        for number, row in enumerate(rows, 1):
+            key = tuple(key_text(row.get(f)) for f in index.fields)
+            if None in key:
+                continue  # Postgres allows repeated NULLs in unique indexes
+            if key in seen:
+                errors.append(f"row {number}: duplicate ({', '.join(index.fields)}) = {key}, first in row {seen[key]}")
+            else:
+                seen[key] = number
+    return errors
+
+
+def relations(model, schema):
+    """(relation field, parent model) for every FK this model owns"""
+    return [(relation, schema.models[relation.type]) for relation in schema.relation_fields(model)
+            if relation.relation_fields]
+
+
+def fixture_keys(parent, referenced, normalised):
+    return {tuple(key_text(row.get(f)) for f in referenced) for row in normalised.get(parent.name, [])}
+
+
+def database_keys(target, parent, referenced):
+    """Referenced key tuples already stored in the parent table"""
+    columns = ', '.join(quote_identifier(parent.field(f).column) for f in referenced)
+    output = run_psql(target, f"COPY (SELECT {columns} FROM {quote_identifier(parent.table)}) TO STDOUT;")
+    return {tuple(None if v == '\\N' else v for v in line.split('\t')) for line in output.splitlines()}
+
+
+def parent_keys(parent, referenced, normalised, target, truncate):
+    """(keys, complete): referenced tuples in the fixture plus, if the table keeps its rows, the database"""
+    keys = fixture_keys(parent, referenced, normalised)
+    keeps_rows = not (truncate and parent.name in normalised)
+    if target is not None and keeps_rows:
+        keys |= database_keys(target, parent, referenced)
+    # Without a database, keys missing from a fixture may still exist in the table
+    return keys, target is not None or not keeps_rows
+
+
+def check_references(model, rows, schema, normalised, target, truncate, key_cache):
+    """FK tuples must exist in the parent fixture, or in the parent table when it keeps its rows"""
+    errors, unchecked = [], set()
+    for relation, parent in relations(model, schema):
+        cache_key = (parent.name, tuple(relation.relation_references))
+        for number, row in enumerate(rows, 1):
+            key = tuple(key_text(row.get(f)) for f in relation.relation_fields)
+            if None in key:
+                continue
+            if cache_key not in key_cache:
+                key_cache[cache_key] = parent_keys(parent, relation.relation_references, normalised, target, truncate)
+            keys, complete = key_cache[cache_key]
+            if key in keys:
+                continue
+            if complete:
+                errors.append(f"row {number}: {relation.name} -> {parent.name} {key} not found")
+            else:
+                unchecked.add(parent.name)
+    return errors, unchecked
+
+
+# ======================
+# COPY
+# ======================
+
+def copy_text(value, field=None):
+    """COPY text-format field"""
+    if value is None:
+        return '\\N'
+    if field is not None and field.type == 'Json' and not field.is_list:
+        value = json.dumps(value)
+    elif isinstance(value, bool):
+        return 't' if value else 'f'
+    elif isinstance(value, list):
+        value = array_literal(value)
+    text = str(value)
+    return text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def array_literal(items):
+    elements = []
+    for item in items:
+        if item is None:
+            elements.append('NULL')
+        else:
+            if isinstance(item, bool):
+                text = 'true' if item else 'false'
+            elif isinstance(item, (dict, list)):
+                text = json.dumps(item)
+            else:
+                text = str(item)
+            elements.append('"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"')
+    return '{' + ','.join(elements) + '}'
+
+
+def copy_fields(model, rows, schema):
+    """Columns to COPY: every stored field, minus database-defaulted ones no row sets"""
+    return [f for f in schema.scalar_fields(model)
+            if not database_defaulted(f) or any(row.get(f.name) is not None for row in rows)]
+
+
+def foreign_key_tables(target):
+    """(referencing table, referenced table) for every FOREIGN KEY on the tables in the search path"""
+    output = run_psql(target, "COPY (SELECT c.relname, p.relname FROM pg_constraint k "
+                              "JOIN pg_class c ON c.oid = k.conrelid JOIN pg_class p ON p.oid = k.confrelid "
+                              "WHERE k.contype = 'f' AND pg_table_is_visible(c.oid)) TO STDOUT;")
+    return {tuple(line.split('\t')) for line in output.splitlines() if line}
+
+
+def truncate_dependents(tables, foreign_keys):
+    """Tables outside `tables` that TRUNCATE ... CASCADE would also empty"""
+    emptied = set(tables)
+    while True:
+        found = {child for child, parent in foreign_keys if parent in emptied and child not in emptied}
+        if not found:
+            return sorted(emptied - set(tables))
+        emptied |= found
+
+
+def copy_rows(model, rows, schema, batch_size):
+    """A COPY per batch of rows, then the serial sequences moved past the loaded ids"""
+    fields = copy_fields(model, rows, schema)
+    table = quote_identifier(model.table)
+    copy = f"COPY {table} ({', '.join(quote_identifier(f.column) for f in fields)}) FROM STDIN;\n"
+
+    for start in range(0, len(rows), batch_size):
+        yield copy
+        yield ''.join('\t'.join(copy_text(row.get(f.name), f) for f in fields) + '\n'
+                      for row in rows[start:start + batch_size])
+        yield '\\.\n'
+    # Explicit ids in serial columns leave the sequence behind
+    for field in fields:
+        if (field.default or '').strip() == 'autoincrement()':
+            column = quote_identifier(field.column)
+            yield (f"SELECT setval(pg_get_serial_sequence('{table}', '{field.column}'), "
+                   f"(SELECT COALESCE(MAX({column}), 1) FROM {table}));\n")
+
+
+def copy_script(models, normalised, schema, batch_size, truncate=False, cascade=False, replica=False):
+    """One transaction for the whole load: optional replica role and TRUNCATE, then each model's COPYs"""
+    yield 'BEGIN;\n'
+    if replica:
+        yield 'SET LOCAL session_replication_role = replica;\n'
+    if truncate:
+        tables = ', '.join(quote_identifier(model.table) for model in models)
+        yield f"TRUNCATE {tables}{' CASCADE' if cascade else ''};\n"
+    for model in models:
+        yield from copy_rows(model, normalised[model.name], schema, batch_size)
+    yield 'COMMIT;\n'
+
+
+# ======================
+# MAIN
+# ======================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load JSON/CSV fixtures into Postgres with COPY")
+    parser.add_argument('fixtures', nargs='+', help="Fixture files or directories of <Model>.json/.csv[.gz]")
+    parser.add_argument('--schema', default=None, help="Path to schema.prisma (default: from config)")
+    parser.add_argument('--database-url', default=None,
+                        help="Target database (default: database_url from config, then $DATABASE_URL)")
+    parser.add_argument('--truncate', action='store_true', help="Empty the loaded tables inside the load's transaction")
+    parser.add_argument('--cascade', action='store_true',
+                        help="With --truncate, also empty tables outside the fixtures that reference the loaded ones")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Rows per COPY statement")
+    parser.add_argument('--dry-run', action='store_true', help="Validate only; nothing is written")
+    parser.add_argument('--allow-remote', action='store_true', help="Permit a non-local database host")
+    tool_metrics.add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def resolve_target(args, config):
+    url = args.database_url or config['database_url'] or os.environ.get('DATABASE_URL')
+    if not url:
+        if args.dry_run:
+            return None
+        raise PostgresError("no database: pass --database-url or set HOPERX_DATABASE_URL/DATABASE_URL")
+    target = DatabaseUrl(url)
+    if not target.is_local and not args.allow_remote:
+        raise PostgresError(f"refusing to load into {target.label}; use --allow-remote for non-local hosts")
+    return target
+
+
+def print_errors(model_name, errors):
+    print(f"❌ {model_name}: {len(errors)} problem(s)")
+    for error in errors[:MAX_ERRORS_SHOWN]:
+        print(f"   {error}")
+    if len(errors) > MAX_ERRORS_SHOWN:
+        print(f"   ... {len(errors) - MAX_ERRORS_SHOWN} more")
+
+
+def load(args):
+    config = load_config()
+    if args.cascade and not args.truncate:
+        print("❌ --cascade only applies with --truncate")
+        return 2
+    try:
+        target = resolve_target(args, config)
+    except PostgresError as e:
+        print(f"❌ {e}")
+        return 2
+
+    with tool_metrics.phase('parse'):
+        schema = load_schema(args.schema or config['schema_path'])
+    with tool_metrics.phase('read'):
+        try:
+            fixtures = read_fixtures(args.fixtures, schema)
+        except (ValueError, OSError) as e:
+            print(f"❌ {e}")
+            return 2
+
+    order, cycles = load_order(list(fixtures), schema)
+    for cycle in cycles:
+        print(f"⚠️  Relation cycle among {', '.join(cycle)}; loading {cycle[0]} first")
+
+    with tool_metrics.phase('validate'):
+        now = datetime.now(timezone.utc).isoformat()
+        normalised, failed, unchecked = {}, False, set()
+        for name in order:
+            normalised[name], errors = normalise_rows(schema.models[name], fixtures[name], schema, now)
+            errors += check_unique(schema.models[name], normalised[name])
+            if errors:
+                print_errors(name, errors)
+                failed = True
+
+        key_cache = {}
+        for name in order:
+            try:
+                errors, missing = check_references(schema.models[name], normalised[name], schema, normalised,
+                                                   target, args.truncate, key_cache)
+            except PostgresError as e:
+                print(f"❌ {e}")
+                return 1
+            unchecked |= missing
+            if errors:
+                print_errors(name, errors)
+                failed = True
+            tool_metrics.count('validated', len(normalised[name]))
+
+    if unchecked:
+        print(f"⚠️  References to {', '.join(sorted(unchecked))} not fully checked (no database to look up)")
+    if failed:
+        print("❌ Fixtures invalid; nothing was written")
+        return 1
+    models = [schema.models[name] for name in order]
+    tables = {model.table for model in models}
+    replica = False
+    if target is not None:
+        try:
+            foreign_keys = foreign_key_tables(target)
+        except PostgresError as e:
+            print(f"❌ {e}")
+            return 1
+        replica = any(child in tables for child, _ in foreign_keys)
+        dependents = truncate_dependents(tables, foreign_keys) if args.truncate else []
+        if dependents and not args.cascade:
+            print(f"❌ {', '.join(dependents)} reference the tables to truncate; "
+                  f"load them too or pass --cascade to empty them as well")
+            return 1
+        if dependents:
+            print(f"⚠️  --cascade: TRUNCATE also empties {', '.join(dependents)}")
+
+    total = sum(len(rows) for rows in normalised.values())
+    if args.dry_run:
+        print(f"✅ {total:,} rows across {len(order)} models are valid (dry run)")
+        return 0
+
+    print(f"📦 Loading {total:,} rows into {target.label}"
+          + (" (foreign key triggers off for the load)" if replica else ''))
+    with tool_metrics.phase('write'):
+        start = time.perf_counter()
+        try:
+            stream_psql(target, copy_script(models, normalised, schema, args.batch_size,
+                                            args.truncate, args.cascade, replica))
+        except PostgresError as e:
+            print(f"❌ {e}")
+            print("   Nothing was written (the load is one transaction)")
+            return 1
+        tool_metrics.count('copied', total)
+    for name in order:
+        print(f"  ✅ {name}: {len(normalised[name]):,} rows")
+    print(f"✅ Loaded {total:,} rows in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tool_metrics.start_run('load', args)
+    try:
+        return load(args)
+    finally:
+        tool_metrics.finish_run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
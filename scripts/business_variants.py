@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Business Type Variants
+Reads the business type configs seeded from backend/prisma/seeds/businessTypeConfigs.js
+and filters the route set down to what each store type actually sees
+"""
+
+import os
+import re
+
+# Feature keys whose routes don't live under a segment of the same name
+FEATURE_ROUTE_SEGMENTS = {
+    'orders': ['orders', 'procurement', 'purchasing'],
+    'suppliers': ['suppliers', 'supplier-invoices'],
+    'team': ['users'],
+    'multiStore': ['multi-store'],
+}
+
+BUSINESS_TYPE_PATTERN = re.compile(r'businessType:\s*"([^"]+)"')
+FEATURE_CONFIG_PATTERN = re.compile(r'featureConfig:\s*\{(.*?)\}', re.DOTALL)
+FEATURE_ENTRY_PATTERN = re.compile(r'(\w+):\s*"(\w+)"')
+
+
+def load_business_type_configs(config_path):
+    """Parse business types and their feature visibility from the seed file"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    variants = []
+    matches = list(BUSINESS_TYPE_PATTERN.finditer(source))
+    for i, match in enumerate(matches):
+        # Only look at the text belonging to this config entry
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(source)
+        block = source[match.end():end]
+
+        feature_config = {}
+        config_match = FEATURE_CONFIG_PATTERN.search(block)
+        if config_match:
+            feature_config = dict(FEATURE_ENTRY_PATTERN.findall(config_match.group(1)))
+
+        variants.append({
+            'businessType': match.group(1),
+            'featureConfig': feature_config,
+        })
+
+    return variants
+
+
+class UnknownVariantError(ValueError):
+    pass
+
+
+def select_variants(variants, names):
+    """Pick variants by business type name (case-insensitive) or slug"""
+    by_key = {}
+    for variant in variants:
+        by_key[variant['businessType'].lower()] = variant
+        by_key[variant_slug(variant['businessType']).lower()] = variant
+
+    selected = []
+    for name in names:
+        variant = by_key.get(name.lower())
+        if variant is None:
+            known = ', '.join(v['businessType'] for v in variants)
+            raise UnknownVariantError(f"Unknown business type '{name}' (known: {known})")
+        selected.append(variant)
+    return selected
+
+
+def variant_slug(business_type):
+    """Turn 'Hospital-based Pharmacy' into 'Hospital_based_Pharmacy' for file names"""
+    return re.sub(r'[^A-Za-z0-9]+', '_', business_type).strip('_')
+
+
+def variant_output_path(base_path, business_type):
+    """Insert the variant slug before the extension of an output path"""
+    root, ext = os.path.splitext(base_path)
+    return f"{root}_{variant_slug(business_type)}{ext}"
+
+
+def hidden_route_segments(feature_config):
+    """Top-level route segments belonging to features hidden for this business type"""
+    segments = set()
+    for feature, visibility in feature_config.items():
+        if visibility == 'hidden':
+            segments.update(FEATURE_ROUTE_SEGMENTS.get(feature, [feature]))
+    return segments
+
+
+def filter_routes_for_variant(routes, variant):
+    """Drop routes whose top-level segment belongs to a hidden feature"""
+    hidden = hidden_route_segments(variant['featureConfig'])
+    return [route for route in routes if route.strip('/').split('/')[0] not in hidden]
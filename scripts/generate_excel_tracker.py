@@ -4,27 +4,81 @@ Master Feature & Verification Excel System Generator
 Generates a comprehensive 7-sheet Excel file for tracking features, testing, bugs, fixes, and releases.
 """
 
-import openpyxl
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.datavalidation import DataValidation
-from datetime import datetime
+import argparse
+import sys
+from functools import lru_cache
 
-def create_master_tracker():
-    """Create the Master Feature & Verification Excel System"""
-    wb = Workbook()
-    wb.remove(wb.active)  # Remove default sheet
-    
-    # Define color scheme
-    HEADER_FILL = PatternFill(start_color="2C3E50", end_color="2C3E50", fill_type="solid")
-    HEADER_FONT = Font(color="FFFFFF", bold=True, size=11)
-    BORDER = Border(
+from business_variants import (
+    load_business_type_configs,
+    UnknownVariantError,
+    select_variants,
+    filter_routes_for_variant,
+    variant_output_path,
+)
+from generate_route_tracker import (
+    extract_routes_from_app_directory,
+    categorize_and_order_routes,
+    determine_feature_category,
+    describe_route,
+)
+from tools_config import load_config
+from tracker_history import DEFAULT_VARIANT, add_snapshot_arguments, snapshot_before_write
+import tool_metrics
+
+DEFAULT_MODULES = ['Auth', 'Inventory', 'POS', 'Billing', 'Messages', 'Dashboard', 'Reports', 'Settings', 'Admin']
+
+@lru_cache(maxsize=None)
+def get_template_styles():
+    """Header styles shared by every sheet, built once per process"""
+    from openpyxl.styles import Font, PatternFill, Border, Side
+    
+    header_fill = PatternFill(start_color="2C3E50", end_color="2C3E50", fill_type="solid")
+    header_font = Font(color="FFFFFF", bold=True, size=11)
+    border = Border(
         left=Side(style='thin', color='CCCCCC'),
         right=Side(style='thin', color='CCCCCC'),
         top=Side(style='thin', color='CCCCCC'),
         bottom=Side(style='thin', color='CCCCCC')
     )
+    return header_fill, header_font, border
+
+def create_master_tracker(output_path=None, routes=None):
+    """Create the Master Feature & Verification Excel System
+    
+    When routes are given, the Feature Master sheet is pre-filled with one row per
+    route and the Modules list is limited to the categories those routes cover.
+    """
+    output_path = output_path or load_config()['master_tracker_path']
+    
+    with tool_metrics.phase('write'):
+        wb = build_master_workbook(routes)
+        tool_metrics.count('sheets', len(wb.worksheets))
+        tool_metrics.count('rows', len(routes or []))
+    
+    # Save the workbook
+    with tool_metrics.phase('save'):
+        wb.save(output_path)
+        tool_metrics.count('outputs')
+    print(f"✅ Excel file created successfully: {output_path}")
+    print(f"📊 Total sheets created: {len(wb.worksheets)}")
+    print(f"🎯 System ready for use!")
+    
+    return output_path
+
+def build_master_workbook(routes=None):
+    """Build all seven sheets in memory"""
+    # openpyxl is only needed here; keep it out of module import time
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
+    from openpyxl.workbook.defined_name import DefinedName
+    from openpyxl.worksheet.datavalidation import DataValidation
+    
+    wb = Workbook()
+    wb.remove(wb.active)  # Remove default sheet
+    
+    # Define color scheme
+    HEADER_FILL, HEADER_FONT, BORDER = get_template_styles()
     
     # ======================
     # 1. REFERENCE DATA SHEET (Create first for validation)
@@ -32,7 +86,7 @@ def create_master_tracker():
     ref_sheet = wb.create_sheet("Reference Data", 0)
     
     reference_data = {
-        'Modules': ['Auth', 'Inventory', 'POS', 'Billing', 'Messages', 'Dashboard', 'Reports', 'Settings', 'Admin'],
+        'Modules': route_modules(routes) if routes else DEFAULT_MODULES,
         'Feature Status': ['Planned', 'In Development', 'Built', 'Deprecated', 'Removed'],
         'Criticality': ['Low', 'Medium', 'High', 'Blocking'],
         'Verification Status': ['✅ Pass', '❌ Fail', '⏸ Partial', '— Not Tested'],
@@ -61,7 +115,6 @@ def create_master_tracker():
         end_row = len(values) + 1
         
         # Create named range using openpyxl's defined_names
-        from openpyxl.workbook.defined_name import DefinedName
         defn = DefinedName(range_name, attr_text=f"'Reference Data'!${col_letter}$2:${col_letter}${end_row}")
         wb.defined_names[range_name] = defn
         
@@ -76,7 +129,7 @@ def create_master_tracker():
     master_headers = [
         'Feature ID', 'Feature Name', 'Module', 'Sub-Module', 'Description',
         'Status', 'Criticality', 'Owner', 'Target Release',
-        'Date Added', 'Date Completed', 'Notes'
+        'Date Added', 'Date Completed', 'Notes', 'Route'
     ]
     
     for col_idx, header in enumerate(master_headers, start=1):
@@ -87,7 +140,7 @@ def create_master_tracker():
         cell.border = BORDER
     
     # Set column widths
-    widths = [12, 30, 15, 20, 40, 15, 12, 15, 15, 12, 12, 30]
+    widths = [12, 30, 15, 20, 40, 15, 12, 15, 15, 12, 12, 30, 30]
     for col_idx, width in enumerate(widths, start=1):
         master_sheet.column_dimensions[get_column_letter(col_idx)].width = width
     
@@ -108,6 +161,13 @@ def create_master_tracker():
     master_sheet.add_data_validation(dv_owner)
     dv_owner.add(f'H2:H1000')
     
+    # Pre-fill one feature per route
+    for row_idx, route in enumerate(routes or [], start=2):
+        master_sheet.cell(row_idx, 1, f"F{row_idx - 1:03d}")
+        master_sheet.cell(row_idx, 2, describe_route(route))
+        master_sheet.cell(row_idx, 3, determine_feature_category(route))
+        master_sheet.cell(row_idx, 13, route)
+    
     # Freeze panes
     master_sheet.freeze_panes = 'B2'
     
@@ -423,14 +483,87 @@ def create_master_tracker():
         sheet.sheet_properties.pageSetUpPr.fitToPage = True
         sheet.page_setup.fitToWidth = 1
     
-    # Save the workbook
-    output_path = '/Users/dikshantjangra/Desktop/hoperxpharma/Master_Feature_Verification_System.xlsx'
-    wb.save(output_path)
-    print(f"✅ Excel file created successfully: {output_path}")
-    print(f"📊 Total sheets created: {len(wb.worksheets)}")
-    print(f"🎯 System ready for use!")
+    return wb
+
+def route_modules(routes):
+    """Feature categories covered by a route set, in first-seen order"""
+    return list(dict.fromkeys(determine_feature_category(route) for route in routes))
+
+def generate_variant_tracker(job):
+    """Build one variant's workbook (runs inside a worker process)"""
+    business_type, routes, output_path = job
+    create_master_tracker(output_path, routes)
+    return business_type, output_path, len(routes)
+
+def generate_variant_trackers(ordered_routes, variants, output_path, workers=None):
+    """Generate one workbook per business type variant across a process pool"""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    jobs = [
+        (
+            variant['businessType'],
+            filter_routes_for_variant(ordered_routes, variant),
+            variant_output_path(output_path, variant['businessType']),
+        )
+        for variant in variants
+    ]
     
-    return output_path
+    # With fork (Linux) workers inherit the warmed style cache; with spawn (macOS/Windows)
+    # each worker starts empty and builds the styles once on its first workbook
+    get_template_styles()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(generate_variant_tracker, jobs))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the Master Feature & Verification workbook")
+    parser.add_argument('--variant', action='append', default=[],
+                        help="Business type to generate a workbook for (repeatable)")
+    parser.add_argument('--all-variants', action='store_true',
+                        help="Generate a workbook for every business type")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes for variant generation (default: CPU count)")
+    add_snapshot_arguments(parser)
+    tool_metrics.add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+def generate_workbooks(args):
+    config = load_config()
+    
+    if not (args.variant or args.all_variants):
+        snapshot_before_write(args, 'workbook', [(DEFAULT_VARIANT, config['master_tracker_path'])], config)
+        create_master_tracker(config['master_tracker_path'])
+        return
+    
+    with tool_metrics.phase('read'):
+        variants = load_business_type_configs(config['business_types_path'])
+        if not args.all_variants:
+            variants = select_variants(variants, args.variant)
+    
+    # Parse routes once; every worker gets its filtered slice
+    with tool_metrics.phase('walk'):
+        routes = extract_routes_from_app_directory(config['app_dir'])
+    with tool_metrics.phase('categorise'):
+        ordered_routes = categorize_and_order_routes(routes)
+    snapshot_before_write(args, 'workbook', [
+        (v['businessType'], variant_output_path(config['master_tracker_path'], v['businessType'])) for v in variants
+    ], config)
+    with tool_metrics.phase('save'):
+        results = generate_variant_trackers(ordered_routes, variants, config['master_tracker_path'], args.workers)
+        tool_metrics.count('outputs', len(results))
+    for business_type, path, count in results:
+        print(f"✅ {business_type}: {count} features -> {path}")
+
+def main(argv=None):
+    args = parse_args(argv)
+    tool_metrics.start_run('tracker', args)
+    try:
+        generate_workbooks(args)
+    except UnknownVariantError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        tool_metrics.finish_run(args)
+    return 0
 
 if __name__ == "__main__":
-    create_master_tracker()
+    sys.exit(main())
@@ -6,13 +6,28 @@ Extracts all routes from Next.js app and creates a simple CSV for tracking
 
 import os
 import csv
+import argparse
+import sys
 from pathlib import Path
 
+from business_variants import (
+    load_business_type_configs,
+    UnknownVariantError,
+    select_variants,
+    filter_routes_for_variant,
+    variant_output_path,
+)
+from tools_config import load_config
+from tracker_history import DEFAULT_VARIANT, add_snapshot_arguments, snapshot_before_write
+import tool_metrics
+
 def extract_routes_from_app_directory(app_dir):
     """Extract all routes from Next.js app directory"""
     routes = []
     
     for root, dirs, files in os.walk(app_dir):
+        tool_metrics.count('directories')
+        tool_metrics.count('files', len(files))
         if 'page.tsx' in files:
             # Get relative path from app directory
             rel_path = os.path.relpath(root, app_dir)
@@ -194,9 +209,17 @@ def determine_feature_category(route):
     else:
         return 'Other'
 
+def describe_route(route):
+    """Generate a readable description from a route"""
+    route_parts = route.strip('/').split('/')
+    if not route_parts or route_parts == ['']:
+        return 'Landing Page'
+    return ' > '.join([p.replace('-', ' ').title() for p in route_parts])
+
 def create_csv_tracker(routes, output_path):
     """Create CSV tracker with all routes"""
     
+    tool_metrics.count('rows', len(routes))
     with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
         writer = csv.writer(csvfile)
         
@@ -216,13 +239,7 @@ def create_csv_tracker(routes, output_path):
         # Data rows
         for route in routes:
             category = determine_feature_category(route)
-            
-            # Generate description from route
-            route_parts = route.strip('/').split('/')
-            if not route_parts or route_parts == ['']:
-                description = 'Landing Page'
-            else:
-                description = ' > '.join([p.replace('-', ' ').title() for p in route_parts])
+            description = describe_route(route)
             
             writer.writerow([
                 route,
@@ -236,20 +253,75 @@ def create_csv_tracker(routes, output_path):
                 ''   # Notes (empty for user to fill)
             ])
 
-def main():
-    app_dir = '/Users/dikshantjangra/Desktop/hoperxpharma/app'
-    output_path = '/Users/dikshantjangra/Desktop/hoperxpharma/Route_Verification_Tracker.csv'
+def generate_variant_tracker(job):
+    """Build one variant's CSV (runs inside a worker process)"""
+    business_type, routes, output_path = job
+    create_csv_tracker(routes, output_path)
+    return business_type, output_path, len(routes)
+
+def generate_variant_trackers(ordered_routes, variants, output_path, workers=None):
+    """Generate one CSV per business type variant across a process pool"""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    jobs = [
+        (
+            variant['businessType'],
+            filter_routes_for_variant(ordered_routes, variant),
+            variant_output_path(output_path, variant['businessType']),
+        )
+        for variant in variants
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(generate_variant_tracker, jobs))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the route verification tracker CSV")
+    parser.add_argument('--variant', action='append', default=[],
+                        help="Business type to generate a tracker for (repeatable)")
+    parser.add_argument('--all-variants', action='store_true',
+                        help="Generate a tracker for every business type")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes for variant generation (default: CPU count)")
+    add_snapshot_arguments(parser)
+    tool_metrics.add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+def generate_trackers(args):
+    config = load_config()
+    output_path = config['route_tracker_path']
     
     print("🔍 Scanning Next.js app directory...")
-    routes = extract_routes_from_app_directory(app_dir)
+    with tool_metrics.phase('walk'):
+        routes = extract_routes_from_app_directory(config['app_dir'])
     
     print(f"📊 Found {len(routes)} unique routes")
     
     print("🔄 Ordering routes by user workflow...")
-    ordered_routes = categorize_and_order_routes(routes)
+    with tool_metrics.phase('categorise'):
+        ordered_routes = categorize_and_order_routes(routes)
     
+    if args.variant or args.all_variants:
+        with tool_metrics.phase('read'):
+            variants = load_business_type_configs(config['business_types_path'])
+            if not args.all_variants:
+                variants = select_variants(variants, args.variant)
+        
+        snapshot_before_write(args, 'routes', [
+            (v['businessType'], variant_output_path(output_path, v['businessType'])) for v in variants
+        ], config)
+        print(f"📝 Creating CSV trackers for {len(variants)} business types...")
+        with tool_metrics.phase('write'):
+            results = generate_variant_trackers(ordered_routes, variants, output_path, args.workers)
+            tool_metrics.count('outputs', len(results))
+        for business_type, path, count in results:
+            print(f"✅ {business_type}: {count} routes -> {path}")
+        return
+    
+    snapshot_before_write(args, 'routes', [(DEFAULT_VARIANT, output_path)], config)
     print("📝 Creating CSV tracker...")
-    create_csv_tracker(ordered_routes, output_path)
+    with tool_metrics.phase('write'):
+        create_csv_tracker(ordered_routes, output_path)
     
     print(f"✅ CSV created successfully: {output_path}")
     print(f"📋 Total routes: {len(ordered_routes)}")
@@ -261,5 +333,17 @@ def main():
     print("  - Future Updates: Planned improvements")
     print("  - Notes: Additional context")
 
+def main(argv=None):
+    args = parse_args(argv)
+    tool_metrics.start_run('routes', args)
+    try:
+        generate_trackers(args)
+    except UnknownVariantError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        tool_metrics.finish_run(args)
+    return 0
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+HopeRx Tools
+Single entry point for the Python tooling. Subcommand modules are imported only
+when that subcommand runs, so hooks that call one command don't pay for the rest.
+
+Usage:
+    python3 scripts/hoperx_tools.py routes [--all-variants]
+    python3 scripts/hoperx_tools.py tracker [--variant "Retail Pharmacy"]
+    python3 scripts/hoperx_tools.py schema remove-duplicate
+    python3 scripts/hoperx_tools.py edit --add new-models.prisma --after model:Prescriber
+    python3 scripts/hoperx_tools.py bench --save-baseline
+    python3 scripts/hoperx_tools.py querylog logs/dev-debug.log pg_stat_statements.csv.gz
+    python3 scripts/hoperx_tools.py compaction --samples-dir samples/ --sql-out compaction.sql
+    python3 scripts/hoperx_tools.py indexbench --candidates-from querylog.json
+    python3 scripts/hoperx_tools.py load fixtures/staging/ --truncate
+    python3 scripts/hoperx_tools.py usage --json
+    python3 scripts/hoperx_tools.py history trends --by category --last 20
+    python3 scripts/hoperx_tools.py startup
+"""
+
+import argparse
+import importlib
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+
+from tools_config import REPO_ROOT, load_config
+
+# Subcommand -> (module under scripts/, help)
+MODULE_COMMANDS = {
+    'routes': ('generate_route_tracker', "Generate the route verification tracker CSV"),
+    'tracker': ('generate_excel_tracker', "Generate the Master Feature & Verification workbook"),
+    'bench': ('bench_tooling', "Benchmark the tooling on scaled synthetic inputs"),
+    'querylog': ('query_log_analyser', "Map query logs onto schema indexes and propose missing ones"),
+    'compaction': ('schema_compaction', "Find stringly-typed/oversized columns and generate the patch"),
+    'indexbench': ('index_bench', "Benchmark candidate indexes on a throwaway local Postgres"),
+    'load': ('bulk_loader', "Validate JSON/CSV fixtures and bulk-load them with COPY"),
+    'usage': ('schema_usage', "Report models, fields, enums and indexes the backend never uses"),
+    'history': ('tracker_history', "Snapshot tracker state per release and report verification trends"),
+    'edit': ('schema_edit', "Add/remove schema blocks under a lock, merging concurrent edits per block"),
+}
+
+# Schema action -> (script path relative to the repo root, help)
+SCHEMA_SCRIPTS = {
+    'insert-models': ('backend/prisma/insert-models.py', "Insert the new prescription models"),
+    'remove-duplicate': ('backend/prisma/remove-duplicate.py', "Remove the duplicate PrescriptionFile model"),
+}
+
+# Modules that must never be imported just to start the CLI
+HEAVY_MODULES = ['openpyxl', 'concurrent.futures', 'multiprocessing', 'csv', 'tracemalloc', 'cProfile']
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='hoperx-tools', description="HopeRx Python tooling")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    # Arguments after the subcommand are handed to the module's own parser
+    for name, (_, help_text) in MODULE_COMMANDS.items():
+        sub = subparsers.add_parser(name, help=help_text, add_help=False)
+        sub.add_argument('args', nargs=argparse.REMAINDER)
+
+    schema = subparsers.add_parser('schema', help="Run a schema.prisma editing script")
+    schema.add_argument('action', choices=sorted(SCHEMA_SCRIPTS))
+    schema.add_argument('args', nargs=argparse.REMAINDER)
+
+    startup = subparsers.add_parser('startup', help="Check CLI startup time against the budget")
+    startup.add_argument('--runs', type=int, default=10, help="Number of timed launches")
+    startup.add_argument('--budget-ms', type=float, default=None,
+                         help="Median startup budget in ms (default: startup_budget_ms from config)")
+
+    return parser
+
+
+def run_module_command(name, argv):
+    module_name, _ = MODULE_COMMANDS[name]
+    module = importlib.import_module(module_name)
+    return module.main(argv)
+
+
+def run_schema_script(action, argv):
+    """Load a hyphenated schema script by path and run its main()"""
+    script_path, _ = SCHEMA_SCRIPTS[action]
+    spec = importlib.util.spec_from_file_location(
+        action.replace('-', '_'), os.path.join(REPO_ROOT, script_path)
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    if '--schema' not in argv:
+        argv = ['--schema', load_config()['schema_path']] + argv
+    return module.main(argv)
+
+
+def measure_startup(runs):
+    """Median wall time (ms) of launching the CLI up to argument parsing"""
+    command = [sys.executable, os.path.abspath(__file__), '--help']
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def heavy_modules_loaded_at_startup():
+    """Heavy modules pulled in by importing the CLI and building its parser"""
+    probe = (
+        "import sys; sys.path.insert(0, {scripts!r}); import hoperx_tools; "
+        "hoperx_tools.build_parser(); "
+        "print(','.join(m for m in {heavy!r} if m in sys.modules))"
+    ).format(scripts=os.path.dirname(os.path.abspath(__file__)), heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True)
+    return [m for m in result.stdout.strip().split(',') if m]
+
+
+def check_startup(runs, budget_ms):
+    budget_ms = budget_ms if budget_ms is not None else load_config()['startup_budget_ms']
+    median_ms = measure_startup(runs)
+    heavy = heavy_modules_loaded_at_startup()
+
+    print(f"⏱️  Median startup: {median_ms:.1f} ms over {runs} runs (budget {budget_ms:.0f} ms)")
+    if heavy:
+        print(f"❌ Heavy modules imported at startup: {', '.join(heavy)}")
+    if median_ms > budget_ms:
+        print("❌ Startup budget exceeded")
+
+    if heavy or median_ms > budget_ms:
+        return 1
+    print("✅ Startup within budget")
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    # argparse.REMAINDER drops leading options, so hand pass-through commands
+    # their arguments untouched
+    if argv and argv[0] in MODULE_COMMANDS:
+        return run_module_command(argv[0], argv[1:])
+    if len(argv) > 1 and argv[0] == 'schema' and argv[1] in SCHEMA_SCRIPTS:
+        return run_schema_script(argv[1], argv[2:])
+
+    args = build_parser().parse_args(argv)
+    if args.command == 'startup':
+        return check_startup(args.runs, args.budget_ms)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Index Benchmark Harness
+Builds a throwaway local Postgres from schema.prisma, fills the models the declared
+queries touch with generated rows, and runs each query under EXPLAIN ANALYZE with the
+declared indexes, without the candidate-equivalent ones, and with each candidate index.
+
+Every variant runs inside a transaction that is rolled back, so index changes never
+leak between variants. Reports latency, shared buffers hit/read and index size.
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+
+from local_postgres import PostgresError, find_server, run_psql
+from prisma_ddl import (column_type, constraint_name, index_ddl, index_name, quote_identifier, quote_literal,
+                        schema_ddl)
+from prisma_schema import load_schema
+from tools_config import load_config
+import tool_metrics
+
+DEFAULT_REPEATS = 5
+DEFAULT_PARENT_ROWS = 10
+DEFAULT_NULL_FRACTION = 0.2
+RANDOM_SEED = 0.42
+RESULT_SEPARATOR = '@@index-bench@@'
+FUTURE_DATE_PATTERN = re.compile(r'expir|due|valid|until|next', re.IGNORECASE)
+
+
+# ======================
+# DATA GENERATION
+# ======================
+
+def foreign_keys(model, schema):
+    """Scalar FK field name -> (parent model, referenced field)"""
+    keys = {}
+    for relation in schema.relation_fields(model):
+        for own, referenced in zip(relation.relation_fields, relation.relation_references):
+            parent = schema.models[relation.type]
+            keys[own] = (parent, parent.field(referenced))
+    return keys
+
+
+def one_to_one_keys(model, schema):
+    """FK fields that are @unique on their own, so each parent row may be referenced once"""
+    keys = foreign_keys(model, schema)
+    return {name: key for name, key in keys.items()
+            if any(i.kind != 'index' and i.fields == [name] for i in model.indexes)}
+
+
+def unique_field_names(model):
+    """Fields that must get a distinct value per row to satisfy @id/@unique/@@unique"""
+    names = set()
+    for index in model.indexes:
+        if index.kind in ('id', 'unique'):
+            names.update(index.fields)
+    return names
+
+
+def key_expression(model, field, row):
+    """Value of a key field for row number `row` (shared by the table and its referrers)"""
+    if field.type in ('Int', 'BigInt'):
+        return row
+    if field.native_type == 'Uuid':
+        return f"md5({quote_literal(model.name + '.' + field.name)} || {row})::uuid"
+    if field.type == 'DateTime':
+        return f"(timestamp '2024-01-01' + {row} * interval '1 second')"
+    prefix = model.name if field.is_id else field.column
+    return f"({quote_literal(prefix + '_')} || {row})"
+
+
+def value_expression(field, schema):
+    """Random value of the field's type"""
+    if field.is_list:
+        return "'{}'"
+    if field.type in schema.enums:
+        labels = ', '.join(quote_literal(v) for v in schema.enums[field.type].values)
+        return f"(ARRAY[{labels}])[1 + floor(random() * {len(schema.enums[field.type].values)})::int]"
+    if field.native_type == 'Uuid':
+        return "md5(random()::text)::uuid"
+    if field.native_type == 'Inet':
+        return "'127.0.0.1'"
+    if field.native_type == 'Xml':
+        return "'<x/>'"
+    if field.type in ('Int', 'BigInt'):
+        return "floor(random() * 1000)"
+    if field.type == 'Float':
+        return "random() * 1000"
+    if field.type == 'Decimal':
+        precision, scale = 65, 30
+        if field.native_args:
+            parts = [int(p) for p in field.native_args.split(',')]
+            precision, scale = parts[0], parts[1] if len(parts) > 1 else 0
+        ceiling = min(1000, 10 ** (precision - scale) - 1) if precision > scale else 0.5
+        return f"round((random() * {ceiling})::numeric, {min(scale, 3)})"
+    if field.type == 'Boolean':
+        return "random() < 0.5"
+    if field.type == 'DateTime':
+        if FUTURE_DATE_PATTERN.search(field.name):
+            return "now() + (random() * 730 - 180) * interval '1 day'"
+        return "now() - random() * interval '365 days'"
+    if field.type == 'Json':
+        return "'{}'"
+    if field.type == 'Bytes':
+        return "decode('', 'hex')"
+    return "substr(md5(random()::text), 1, 16)"
+
+
+def null_fraction(model, field, nulls):
+    for key in (f"{model.name}.{field.name}", f"*.{field.name}"):
+        if key in nulls:
+            return float(nulls[key])
+    return DEFAULT_NULL_FRACTION
+
+
+def column_expression(model, field, schema, rows, nulls):
+    keys = foreign_keys(model, schema)
+    unique = unique_field_names(model)
+
+    if field.name in keys:
+        parent, referenced = keys[field.name]
+        if field.name in one_to_one_keys(model, schema):
+            parent_row = 'g'  # 1:1 relation: load_plan gives a loaded parent at least as many rows
+        else:
+            parent_row = f"(1 + floor(random() * {rows.get(parent.name, DEFAULT_PARENT_ROWS)})::int)"
+        expression = key_expression(parent, referenced, parent_row)
+    elif field.name in unique and field.type not in schema.enums and field.type != 'Boolean':
+        expression = key_expression(model, field, 'g')
+    else:
+        expression = value_expression(field, schema)
+
+    if field.optional:
+        expression = f"CASE WHEN random() < {null_fraction(model, field, nulls)} THEN NULL ELSE {expression} END"
+    return f"({expression})::{column_type(field, schema)}"
+
+
+def insert_statement(model, schema, rows, nulls):
+    """INSERT ... SELECT over generate_series, so rows are generated inside Postgres"""
+    fields = [f for f in schema.scalar_fields(model)
+              if not (f.default and f.default.strip() == 'autoincrement()')]
+    columns = ', '.join(quote_identifier(f.column) for f in fields)
+    expressions = ',\n       '.join(column_expression(model, f, schema, rows, nulls) for f in fields)
+    return (f"SELECT setseed({RANDOM_SEED});\n"
+            f"INSERT INTO {quote_identifier(model.table)} ({columns})\n"
+            f"SELECT {expressions}\n"
+            f"FROM generate_series(1, {rows[model.name]}) AS g;\n")
+
+
+def load_database(server, schema, rows, nulls):
+    """Create every table, fill the benchmarked models, then build their declared indexes"""
+    with tool_metrics.phase('schema'):
+        run_psql(server, '\n'.join(schema_ddl(schema, include_indexes=False)))
+        tool_metrics.count('tables', len(schema.models))
+
+    with tool_metrics.phase('load'):
+        for name, count in rows.items():
+            start = time.perf_counter()
+            run_psql(server, insert_statement(schema.models[name], schema, rows, nulls))
+            tool_metrics.count('rows', count)
+            print(f"  ✅ {name}: {count:,} rows ({time.perf_counter() - start:.1f}s)")
+
+    # Empty tables don't need their indexes to plan the declared queries
+    with tool_metrics.phase('index'):
+        for model in (schema.models[name] for name in rows):
+            for index in model.indexes:
+                statement = index_ddl(model, index)
+                if not statement:
+                    continue
+                try:
+                    run_psql(server, statement)
+                except PostgresError as e:
+                    raise PostgresError(f"declared {model.name} index {index.raw} failed to build: {e}") from e
+                tool_metrics.count('indexes')
+        run_psql(server, 'VACUUM ANALYZE;')
+
+
+def index_sizes(server):
+    output = run_psql(server, "SELECT indexrelname || '|' || pg_relation_size(indexrelid) FROM pg_stat_user_indexes;")
+    return {name: int(size) for name, size in (line.rsplit('|', 1) for line in output.splitlines() if line)}
+
+
+# ======================
+# CANDIDATES
+# ======================
+
+def resolve_candidate(raw, schema):
+    model = schema.models.get(raw['model']) or schema.model_for_table(raw['model'])
+    if model is None:
+        raise ValueError(f"unknown model {raw['model']}")
+    columns = []
+    for name in raw['fields']:
+        field = model.field(name) or model.field_for_column(name)
+        if field is None:
+            raise ValueError(f"{model.name} has no field {name}")
+        columns.append(field.column)
+
+    where = raw.get('where')
+    label = f"+ {model.name}({', '.join(columns)})" + (f" WHERE {where}" if where else '')
+    name = constraint_name(model.table, columns, 'candidate')
+    column_list = ', '.join(quote_identifier(c) for c in columns)
+    ddl = f"CREATE INDEX {quote_identifier(name)} ON {quote_identifier(model.table)}({column_list})"
+    return {
+        'model': model, 'columns': columns, 'where': where, 'label': label, 'name': name,
+        'ddl': ddl + (f" WHERE {where};" if where else ';'),
+    }
+
+
+def parse_candidate_option(value):
+    """Model:field1,field2"""
+    model, _, fields = value.partition(':')
+    if not fields:
+        raise argparse.ArgumentTypeError(f"expected Model:field1,field2, got {value!r}")
+    return {'model': model, 'fields': [f.strip() for f in fields.split(',')]}
+
+
+def query_candidates(query, extra, schema):
+    """Candidates declared on the query plus command-line/query-log ones on tables it touches"""
+    candidates = [resolve_candidate(c, schema) for c in query.get('candidates', [])]
+    for raw in extra:
+        candidate = resolve_candidate(raw, schema)
+        if quote_identifier(candidate['model'].table) in query['sql']:
+            candidates.append(candidate)
+
+    unique = {}
+    for candidate in candidates:
+        unique.setdefault((candidate['model'].name, tuple(candidate['columns']), candidate['where']), candidate)
+    return list(unique.values())
+
+
+def hidden_indexes(candidates):
+    """Declared indexes identical to a full (non-partial) candidate, dropped for the baseline"""
+    hidden = []
+    for candidate in candidates:
+        if candidate['where']:
+            continue
+        model = candidate['model']
+        for index in model.indexes:
+            columns = [model.field(f).column for f in index.fields]
+            if index.kind != 'id' and columns == candidate['columns']:
+                name = index_name(model, index)
+                if name not in hidden:
+                    hidden.append(name)
+    return hidden
+
+
+# ======================
+# MEASUREMENT
+# ======================
+
+def scan_nodes(plan):
+    """'Index Scan (name)' / 'Seq Scan (table)' for every scan in a plan tree"""
+    nodes = []
+    target = plan.get('Index Name') or plan.get('Relation Name')
+    if target:
+        nodes.append(f"{plan['Node Type']} ({target})")
+    for child in plan.get('Plans', []):
+        nodes.extend(scan_nodes(child))
+    return nodes
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2] if values else 0.0
+
+
+def run_variant(server, query, label, hidden, candidate, repeats):
+    """EXPLAIN ANALYZE a query repeats + 1 times in a rolled-back transaction (first run is warm-up)"""
+    sql = query['sql'].strip().rstrip(';')
+    script = ['BEGIN;']
+    script += [f"DROP INDEX {quote_identifier(name)};" for name in hidden]
+    if candidate:
+        script.append(candidate['ddl'])
+    for _ in range(repeats + 1):
+        script += [f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql};", f"\\echo {RESULT_SEPARATOR}"]
+    if candidate:
+        script.append(f"SELECT pg_relation_size({quote_literal(quote_identifier(candidate['name']))}::regclass);")
+    script.append('ROLLBACK;')
+
+    chunks = run_psql(server, '\n'.join(script)).split(RESULT_SEPARATOR + '\n')
+    explains = [json.loads(chunk[chunk.index('['):])[0] for chunk in chunks[:-1]][1:]
+    last = explains[-1]['Plan']
+    return {
+        'variant': label,
+        'hidden': hidden,
+        'execution_ms': median(e['Execution Time'] for e in explains),
+        'planning_ms': median(e['Planning Time'] for e in explains),
+        'shared_hit': last.get('Shared Hit Blocks', 0),
+        'shared_read': last.get('Shared Read Blocks', 0),
+        'rows': last.get('Actual Rows', 0),
+        'scans': scan_nodes(last),
+        'candidate_bytes': int(chunks[-1].strip()) if candidate else None,
+    }
+
+
+def bench_query(server, query, extra_candidates, schema, repeats):
+    candidates = query_candidates(query, extra_candidates, schema)
+    hidden = hidden_indexes(candidates)
+
+    variants = [run_variant(server, query, 'declared', [], None, repeats)]
+    if hidden:
+        variants.append(run_variant(server, query, 'without candidates', hidden, None, repeats))
+    for candidate in candidates:
+        variants.append(run_variant(server, query, candidate['label'], hidden, candidate, repeats))
+    return {'query': query['name'], 'description': query.get('description', ''), 'variants': variants}
+
+
+# ======================
+# REPORT
+# ======================
+
+def format_bytes(size):
+    if size is None:
+        return '-'
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def print_report(results, sizes):
+    for result in results:
+        print(f"\n🔍 {result['query']}" + (f" — {result['description']}" if result['description'] else ''))
+        print(f"  {'variant':<58}{'exec ms':>10}{'vs decl':>9}{'plan ms':>9}{'hit':>8}{'read':>8}{'index size':>12}  scans")
+        baseline = result['variants'][0]['execution_ms'] or None
+        for variant in result['variants']:
+            size = variant['candidate_bytes']
+            if size is None:
+                used = [s[s.index('(') + 1:-1] for s in variant['scans']]
+                size = sum(sizes[u] for u in used if u in sizes) or None
+            speedup = f"{baseline / variant['execution_ms']:.2f}x" if baseline and variant['execution_ms'] else '-'
+            print(f"  {variant['variant'][:57]:<58}{variant['execution_ms']:>10.3f}{speedup:>9}{variant['planning_ms']:>9.3f}"
+                  f"{variant['shared_hit']:>8}{variant['shared_read']:>8}{format_bytes(size):>12}  "
+                  f"{'; '.join(variant['scans'])}")
+        hidden = result['variants'][-1]['hidden']
+        if hidden:
+            print(f"  ℹ️  'without candidates' drops: {', '.join(hidden)}")
+
+
+# ======================
+# MAIN
+# ======================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark candidate indexes against a throwaway local Postgres")
+    parser.add_argument('--schema', default=None, help="Path to schema.prisma (default: from config)")
+    parser.add_argument('--queries', default=None, help="Declared queries JSON (default: from config)")
+    parser.add_argument('--query', action='append', default=[], help="Only run this named query (repeatable)")
+    parser.add_argument('--candidate', action='append', default=[], type=parse_candidate_option,
+                        metavar='MODEL:FIELDS', help="Extra candidate index for queries on that model (repeatable)")
+    parser.add_argument('--candidates-from', metavar='JSON',
+                        help="Use the proposals from 'querylog --json' output as candidates")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiply every declared row count")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="Timed runs per variant")
+    parser.add_argument('--server', choices=['auto', 'binary', 'container'], default='auto',
+                        help="Where the throwaway Postgres comes from")
+    parser.add_argument('--pg-bin', default=None, help="Directory with initdb/pg_ctl/psql (default: from config)")
+    parser.add_argument('--image', default=None, help="Local container image (default: from config)")
+    parser.add_argument('--json', dest='json_out', help="Also write the results as JSON here")
+    tool_metrics.add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def load_plan(args, schema):
+    queries_path = args.queries or load_config()['index_bench_queries_path']
+    with open(queries_path, 'r', encoding='utf-8') as f:
+        plan = json.load(f)
+
+    queries = [q for q in plan['queries'] if not args.query or q['name'] in args.query]
+    unknown = set(args.query) - {q['name'] for q in queries}
+    if unknown:
+        raise ValueError(f"unknown queries: {', '.join(sorted(unknown))}")
+
+    rows = {name: max(1, int(count * args.scale)) for name, count in plan['rows'].items()}
+    missing = [name for name in rows if name not in schema.models]
+    if missing:
+        raise ValueError(f"rows declared for unknown models: {', '.join(missing)}")
+
+    # Every row of a 1:1 child needs a parent row of its own
+    resized = True
+    while resized:
+        resized = False
+        for name in list(rows):
+            for parent, _ in one_to_one_keys(schema.models[name], schema).values():
+                if rows.get(parent.name, rows[name]) < rows[name]:
+                    rows[parent.name], resized = rows[name], True
+
+    extra = list(args.candidate)
+    if args.candidates_from:
+        with open(args.candidates_from, 'r', encoding='utf-8') as f:
+            extra += [{'model': p['model'], 'fields': p['fields']} for p in json.load(f).get('proposals', [])]
+    return queries, rows, plan.get('nulls', {}), extra
+
+
+def benchmark(args):
+    config = load_config()
+    with tool_metrics.phase('parse'):
+        schema = load_schema(args.schema or config['schema_path'])
+        try:
+            queries, rows, nulls, extra = load_plan(args, schema)
+            for query in queries:
+                query_candidates(query, extra, schema)
+        except (ValueError, KeyError) as e:
+            print(f"❌ {e}")
+            return 2
+
+    try:
+        server = find_server(args.server, bin_dir=args.pg_bin or config['pg_bin_dir'] or None,
+                             image=args.image or config['pg_image'])
+    except PostgresError as e:
+        print(f"❌ {e}")
+        return 2
+
+    try:
+        print(f"🐘 Starting throwaway Postgres from {server.label}")
+        server.start()
+        print(f"📦 Loading {sum(rows.values()):,} generated rows")
+        load_database(server, schema, rows, nulls)
+        sizes = index_sizes(server)
+
+        results = []
+        with tool_metrics.phase('explain'):
+            for query in queries:
+                results.append(bench_query(server, query, extra, schema, args.repeats))
+                tool_metrics.count('queries')
+    except PostgresError as e:
+        print(f"❌ {e}")
+        return 2
+    finally:
+        server.stop()
+
+    print_report(results, sizes)
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump({'rows': rows, 'results': results, 'index_sizes': sizes}, f, indent=2)
+        print(f"\n✅ Results written: {args.json_out}")
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tool_metrics.start_run('indexbench', args)
+    try:
+        return benchmark(args)
+    finally:
+        tool_metrics.finish_run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
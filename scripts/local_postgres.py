@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Local Postgres
+Starts a throwaway Postgres for the tooling from binaries or a container image that
+are already on this machine (nothing is downloaded), or targets an existing database
+by URL, and runs SQL through psql. Throwaway servers never listen on a network interface.
+"""
+
+import glob
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+
+SUPERUSER = 'postgres'
+DEFAULT_PORT = 5432
+READY_TIMEOUT_SECONDS = 60
+CONTAINER_RUNTIMES = ['docker', 'podman']
+SERVER_BINARIES = ['initdb', 'pg_ctl', 'psql']
+
+# Durability off: the cluster is thrown away after the run
+THROWAWAY_SETTINGS = {
+    'fsync': 'off',
+    'synchronous_commit': 'off',
+    'full_page_writes': 'off',
+    'shared_buffers': '256MB',
+}
+
+PSQL_FLAGS = ['-X', '-q', '-A', '-t', '-v', 'ON_ERROR_STOP=1']
+
+LOCAL_HOSTS = {'', 'localhost', '127.0.0.1', '::1'}
+# Query parameters Prisma understands but libpq rejects
+PRISMA_URL_PARAMETERS = {'schema', 'connection_limit', 'pool_timeout', 'pgbouncer', 'socket_timeout',
+                         'connect_timeout_ms', 'statement_cache_size', 'sslaccept'}
+
+
+class PostgresError(RuntimeError):
+    pass
+
+
+class BinaryServer:
+    """Cluster from local initdb/pg_ctl, reachable only through a socket in its temp dir"""
+
+    def __init__(self, bin_dir, settings=None):
+        self.bin_dir = bin_dir
+        self.settings = {**THROWAWAY_SETTINGS, **(settings or {})}
+        self.work_dir = None
+
+    @property
+    def label(self):
+        return f"local binaries ({self.bin_dir})"
+
+    def tool(self, name):
+        return os.path.join(self.bin_dir, name)
+
+    def start(self):
+        self.work_dir = tempfile.mkdtemp(prefix='hoperx-pg-')
+        data_dir = os.path.join(self.work_dir, 'data')
+        run_checked([self.tool('initdb'), '-D', data_dir, '-U', SUPERUSER, '-A', 'trust', '-E', 'UTF8', '--no-sync'])
+
+        options = [f"-k {self.work_dir}", "-c listen_addresses=''", f"-p {DEFAULT_PORT}"]
+        options += [f"-c {key}={value}" for key, value in self.settings.items()]
+        run_checked([self.tool('pg_ctl'), '-D', data_dir, '-l', os.path.join(self.work_dir, 'server.log'),
+                     '-w', '-t', str(READY_TIMEOUT_SECONDS), '-o', ' '.join(options), 'start'])
+
+    def psql_command(self):
+        return [self.tool('psql'), '-h', self.work_dir, '-p', str(DEFAULT_PORT), '-U', SUPERUSER, '-d', 'postgres']
+
+    def stop(self):
+        if not self.work_dir:
+            return
+        subprocess.run([self.tool('pg_ctl'), '-D', os.path.join(self.work_dir, 'data'), '-m', 'immediate', '-w', 'stop'],
+                       capture_output=True)
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        self.work_dir = None
+
+
+class ContainerServer:
+    """Container from a locally present image, started with no network attached"""
+
+    def __init__(self, runtime, image, settings=None):
+        self.runtime = runtime
+        self.image = image
+        self.settings = {**THROWAWAY_SETTINGS, **(settings or {})}
+        self.container = None
+
+    @property
+    def label(self):
+        return f"{self.runtime} image {self.image}"
+
+    def start(self):
+        command = [self.runtime, 'run', '-d', '--rm', '--network', 'none',
+                   '-e', 'POSTGRES_HOST_AUTH_METHOD=trust', self.image]
+        for key, value in self.settings.items():
+            command += ['-c', f"{key}={value}"]
+        self.container = run_checked(command).strip()
+
+        # The entrypoint's init server only listens on its socket; loopback answers once the real one is up
+        deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            probe = subprocess.run([self.runtime, 'exec', self.container, 'pg_isready', '-h', '127.0.0.1',
+                                    '-U', SUPERUSER], capture_output=True)
+            if probe.returncode == 0:
+                return
+            time.sleep(0.5)
+        raise PostgresError(f"{self.image} did not become ready within {READY_TIMEOUT_SECONDS}s")
+
+    def psql_command(self):
+        return [self.runtime, 'exec', '-i', self.container, 'psql', '-h', '127.0.0.1', '-U', SUPERUSER, '-d', 'postgres']
+
+    def stop(self):
+        if self.container:
+            subprocess.run([self.runtime, 'rm', '-f', self.container], capture_output=True)
+            self.container = None
+
+
+class DatabaseUrl:
+    """Existing database addressed by a postgresql:// URL such as DATABASE_URL"""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        if parts.scheme not in ('postgres', 'postgresql'):
+            raise PostgresError(f"not a postgres URL: {parts.scheme or url!r}")
+        self.host = parts.hostname or ''
+        self.database = parts.path.lstrip('/')
+
+        query = dict(parse_qsl(parts.query))
+        self.host = self.host or query.get('host', '')
+        schema = query.get('schema')
+        query = {k: v for k, v in query.items() if k not in PRISMA_URL_PARAMETERS}
+        if schema and schema != 'public':
+            query['options'] = f"-c search_path={schema}"
+        self.url = urlunsplit(parts._replace(query=urlencode(query, quote_via=quote)))
+
+    @property
+    def label(self):
+        return f"{self.database} on {self.host or 'local socket'}"
+
+    @property
+    def is_local(self):
+        return self.host in LOCAL_HOSTS or self.host.startswith('/')
+
+    def psql_command(self):
+        return [psql_binary(), '-d', self.url]
+
+
+def psql_binary():
+    if shutil.which('psql'):
+        return 'psql'
+    bin_dir = find_bin_dir()
+    if bin_dir is None:
+        raise PostgresError("psql not found on PATH or in the usual Postgres install locations")
+    return os.path.join(bin_dir, 'psql')
+
+
+def run_checked(command):
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+    except OSError as e:
+        raise PostgresError(f"{command[0]}: {e}")
+    if result.returncode != 0:
+        raise PostgresError(f"{os.path.basename(command[0])} failed: {result.stderr.strip() or result.stdout.strip()}")
+    return result.stdout
+
+
+def has_binaries(directory):
+    return all(os.access(os.path.join(directory, name), os.X_OK) for name in SERVER_BINARIES)
+
+
+def find_bin_dir(bin_dir=None):
+    """Directory holding initdb, pg_ctl and psql: explicit, PATH, pg_config, then distro locations"""
+    if bin_dir:
+        return bin_dir if has_binaries(bin_dir) else None
+
+    candidates = []
+    pg_ctl = shutil.which('pg_ctl')
+    if pg_ctl:
+        candidates.append(os.path.dirname(pg_ctl))
+    if shutil.which('pg_config'):
+        result = subprocess.run(['pg_config', '--bindir'], capture_output=True, text=True)
+        if result.returncode == 0:
+            candidates.append(result.stdout.strip())
+    # Debian/Ubuntu keep initdb off PATH
+    candidates += sorted(glob.glob('/usr/lib/postgresql/*/bin'), reverse=True)
+    candidates += sorted(glob.glob('/usr/pgsql-*/bin'), reverse=True)
+    candidates += ['/opt/homebrew/bin', '/usr/local/bin']
+
+    for candidate in candidates:
+        if has_binaries(candidate):
+            return candidate
+    return None
+
+
+def find_container_runtime(image):
+    """First container runtime that already has the image (never pulls)"""
+    for runtime in CONTAINER_RUNTIMES:
+        if not shutil.which(runtime):
+            continue
+        probe = subprocess.run([runtime, 'image', 'inspect', image], capture_output=True)
+        if probe.returncode == 0:
+            return runtime
+    return None
+
+
+def find_server(mode='auto', bin_dir=None, image=None, settings=None):
+    """A stopped throwaway server, or PostgresError explaining what was looked for"""
+    if mode in ('auto', 'binary'):
+        found = find_bin_dir(bin_dir)
+        if found:
+            return BinaryServer(found, settings)
+        if mode == 'binary':
+            raise PostgresError(f"initdb/pg_ctl/psql not found{' in ' + bin_dir if bin_dir else ''}; "
+                                "set --pg-bin or HOPERX_PG_BIN_DIR")
+    if image:
+        runtime = find_container_runtime(image)
+        if runtime:
+            return ContainerServer(runtime, image, settings)
+    raise PostgresError(
+        "no local Postgres found: install the server binaries (initdb, pg_ctl, psql) "
+        f"or load the {image} image into docker/podman beforehand"
+    )
+
+
+def run_psql(server, sql):
+    """Run a script through psql (unaligned, tuples only) and return stdout"""
+    result = subprocess.run(server.psql_command() + PSQL_FLAGS, input=sql, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise PostgresError(result.stderr.strip())
+    return result.stdout
+
+
+def stream_psql(server, chunks):
+    """Feed a script to psql piece by piece (for COPY data too big to build in memory)"""
+    with tempfile.TemporaryFile(mode='w+') as errors:
+        process = subprocess.Popen(server.psql_command() + PSQL_FLAGS, stdin=subprocess.PIPE,
+                                   stdout=subprocess.DEVNULL, stderr=errors, text=True)
+        try:
+            for chunk in chunks:
+                process.stdin.write(chunk)
+            process.stdin.close()
+        except BrokenPipeError:
+            pass  # psql stopped on an error; its message is in stderr
+        if process.wait() != 0:
+            errors.seek(0)
+            raise PostgresError(errors.read().strip() or f"psql exited with {process.returncode}")
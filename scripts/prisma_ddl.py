@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Prisma Schema -> Postgres DDL
+Generates the CREATE TYPE / CREATE TABLE / CREATE INDEX statements Prisma Migrate
+would emit for schema.prisma, using Prisma's default constraint and index names.
+No foreign keys: the schema uses relationMode = "prisma".
+"""
+
+import re
+
+POSTGRES_IDENTIFIER_LIMIT = 63
+
+# Prisma scalar -> default Postgres column type
+SCALAR_COLUMN_TYPES = {
+    'String': 'TEXT',
+    'Int': 'INTEGER',
+    'BigInt': 'BIGINT',
+    'Float': 'DOUBLE PRECISION',
+    'Decimal': 'DECIMAL(65,30)',
+    'Boolean': 'BOOLEAN',
+    'DateTime': 'TIMESTAMP(3)',
+    'Json': 'JSONB',
+    'Bytes': 'BYTEA',
+}
+
+# @db.<NativeType> -> Postgres type (arguments are appended when given)
+NATIVE_COLUMN_TYPES = {
+    'Text': 'TEXT',
+    'VarChar': 'VARCHAR',
+    'Char': 'CHAR',
+    'Uuid': 'UUID',
+    'Decimal': 'DECIMAL',
+    'Money': 'MONEY',
+    'Integer': 'INTEGER',
+    'SmallInt': 'SMALLINT',
+    'BigInt': 'BIGINT',
+    'Real': 'REAL',
+    'DoublePrecision': 'DOUBLE PRECISION',
+    'Boolean': 'BOOLEAN',
+    'Timestamp': 'TIMESTAMP',
+    'Timestamptz': 'TIMESTAMPTZ',
+    'Date': 'DATE',
+    'Time': 'TIME',
+    'Timetz': 'TIMETZ',
+    'Json': 'JSON',
+    'JsonB': 'JSONB',
+    'ByteA': 'BYTEA',
+    'Inet': 'INET',
+    'Xml': 'XML',
+}
+
+# Defaults Prisma generates in the client rather than the database
+CLIENT_SIDE_DEFAULTS = ('cuid(', 'uuid(', 'nanoid(', 'ulid(')
+
+NUMBER_PATTERN = re.compile(r'^-?\d+(\.\d+)?$')
+STRING_PATTERN = re.compile(r'^"((?:[^"\\]|\\.)*)"$')
+DBGENERATED_PATTERN = re.compile(r'^dbgenerated\(\s*"((?:[^"\\]|\\.)*)"\s*\)$')
+
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def quote_literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def constraint_name(table, columns, suffix):
+    """Prisma's default name: <table>_<col>_..._<suffix>, trimmed to Postgres' limit"""
+    name = '_'.join([table] + list(columns) + [suffix])
+    if len(name) > POSTGRES_IDENTIFIER_LIMIT:
+        name = name[:POSTGRES_IDENTIFIER_LIMIT - len(suffix) - 1] + '_' + suffix
+    return name
+
+
+def columns_for(model, field_names):
+    return [(model.field(name).column if model.field(name) else name) for name in field_names]
+
+
+def column_type(field, schema):
+    if field.type in schema.enums:
+        base = quote_identifier(schema.enums[field.type].db_name)
+    elif field.native_type in NATIVE_COLUMN_TYPES:
+        base = NATIVE_COLUMN_TYPES[field.native_type]
+        if field.native_args:
+            base += f"({field.native_args.replace(' ', '')})"
+    else:
+        base = SCALAR_COLUMN_TYPES.get(field.type, 'TEXT')
+
+    if field.default and field.default.strip() == 'autoincrement()':
+        base = {'BIGINT': 'BIGSERIAL', 'SMALLINT': 'SMALLSERIAL'}.get(base, 'SERIAL')
+    return base + ('[]' if field.is_list else '')
+
+
+def default_literal(value, field, schema):
+    """SQL for one scalar default value, or None when it isn't a database default"""
+    value = value.strip()
+    if value == 'now()':
+        return 'CURRENT_TIMESTAMP'
+    if value == 'autoincrement()' or value.startswith(CLIENT_SIDE_DEFAULTS):
+        return None
+    generated = DBGENERATED_PATTERN.match(value)
+    if generated:
+        return generated.group(1).replace('\\"', '"')
+    if value in ('true', 'false'):
+        return value
+    if NUMBER_PATTERN.match(value):
+        return value
+    string = STRING_PATTERN.match(value)
+    if string:
+        return quote_literal(string.group(1).replace('\\"', '"'))
+    if field.type in schema.enums:
+        return quote_literal(value)
+    return None
+
+
+def column_default(field, schema):
+    if field.default is None:
+        return None
+    default = field.default.strip()
+    if field.is_list and default.startswith('['):
+        items = [default_literal(item, field, schema) for item in default[1:-1].split(',') if item.strip()]
+        element_type = column_type(field, schema)[:-2]
+        return f"ARRAY[{', '.join(items)}]::{element_type}[]"
+    return default_literal(default, field, schema)
+
+
+def enum_ddl(enum):
+    labels = ', '.join(quote_literal(value) for value in enum.values)
+    return f"CREATE TYPE {quote_identifier(enum.db_name)} AS ENUM ({labels});"
+
+
+def primary_key_columns(model):
+    for index in model.indexes:
+        if index.kind == 'id':
+            return columns_for(model, index.fields), index.name
+    return [], ''
+
+
+def table_ddl(model, schema):
+    lines = []
+    for field in schema.scalar_fields(model):
+        definition = f"    {quote_identifier(field.column)} {column_type(field, schema)}"
+        if not field.optional and not field.is_list:
+            definition += ' NOT NULL'
+        default = column_default(field, schema)
+        if default is not None:
+            definition += f" DEFAULT {default}"
+        lines.append(definition)
+
+    pk_columns, pk_name = primary_key_columns(model)
+    if pk_columns:
+        name = pk_name or constraint_name(model.table, [], 'pkey')
+        column_list = ', '.join(quote_identifier(c) for c in pk_columns)
+        lines.append(f"    CONSTRAINT {quote_identifier(name)} PRIMARY KEY ({column_list})")
+
+    return f"CREATE TABLE {quote_identifier(model.table)} (\n" + ',\n'.join(lines) + "\n);"
+
+
+def index_name(model, index):
+    if index.name:
+        return index.name
+    suffix = 'key' if index.kind == 'unique' else 'idx'
+    return constraint_name(model.table, columns_for(model, index.fields), suffix)
+
+
+def index_ddl(model, index, name=None):
+    """CREATE [UNIQUE] INDEX for an @@index/@@unique/@unique (None for primary keys)"""
+    if index.kind == 'id':
+        return None
+    unique = 'UNIQUE ' if index.kind == 'unique' else ''
+    method = f" USING {index.type.upper()}" if index.type else ''
+    column_list = ', '.join(quote_identifier(c) for c in columns_for(model, index.fields))
+    return (f"CREATE {unique}INDEX {quote_identifier(name or index_name(model, index))} "
+            f"ON {quote_identifier(model.table)}{method}({column_list});")
+
+
+def schema_ddl(schema, models=None, include_indexes=True):
+    """DDL statements for the enums and models (all models when none are given)"""
+    models = [schema.models[name] for name in models] if models else list(schema.models.values())
+    statements = [enum_ddl(enum) for enum in schema.enums.values()]
+    statements.extend(table_ddl(model, schema) for model in models)
+    if include_indexes:
+        for model in models:
+            for index in model.indexes:
+                statement = index_ddl(model, index)
+                if statement:
+                    statements.append(statement)
+    return statements
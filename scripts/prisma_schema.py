@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Prisma Schema Parser
+Splits schema.prisma into top-level blocks and parses models, fields, enums and
+index declarations (@@index/@@unique/@@id plus field-level @id/@unique).
+Line-based like the editing scripts: every block closes with a '}' on its own line.
+"""
+
+import re
+from dataclasses import dataclass, field as dataclass_field
+
+SCALAR_TYPES = {'String', 'Int', 'BigInt', 'Float', 'Decimal', 'Boolean', 'DateTime', 'Json', 'Bytes'}
+
+BLOCK_START_PATTERN = re.compile(r'^(model|enum|generator|datasource|view|type)\s+(\w+)\s*\{')
+MAP_PATTERN = re.compile(r'@map\(\s*(?:name:\s*)?"([^"]+)"')
+BLOCK_MAP_PATTERN = re.compile(r'@@map\(\s*(?:name:\s*)?"([^"]+)"')
+NATIVE_TYPE_PATTERN = re.compile(r'@db\.(\w+)(?:\(([^)]*)\))?')
+INDEX_NAME_PATTERN = re.compile(r'\b(?:map|name):\s*"([^"]+)"')
+INDEX_TYPE_PATTERN = re.compile(r'\btype:\s*(\w+)')
+
+
+@dataclass
+class Block:
+    kind: str
+    name: str
+    start_line: int  # 0-indexed line of 'model X {'
+    end_line: int    # 0-indexed line of the closing '}'
+    text: str
+
+
+@dataclass
+class Field:
+    name: str
+    type: str
+    optional: bool = False
+    is_list: bool = False
+    attributes: str = ''
+    comment: str = ''
+    column: str = ''
+    native_type: str = ''
+    native_args: str = ''
+    default: str = None
+    is_id: bool = False
+    is_unique: bool = False
+    relation_fields: list = dataclass_field(default_factory=list)
+    relation_references: list = dataclass_field(default_factory=list)
+
+    @property
+    def is_scalar(self):
+        return self.type in SCALAR_TYPES
+
+
+@dataclass
+class Index:
+    kind: str  # 'index', 'unique' or 'id'
+    fields: list
+    name: str = ''
+    type: str = ''
+    raw: str = ''
+
+
+@dataclass
+class Model:
+    name: str
+    table: str
+    fields: list
+    indexes: list
+    block: Block
+
+    def field(self, name):
+        for f in self.fields:
+            if f.name == name:
+                return f
+        return None
+
+    def field_for_column(self, column):
+        for f in self.fields:
+            if f.column == column:
+                return f
+        return None
+
+
+@dataclass
+class Enum:
+    name: str
+    values: list
+    db_name: str
+    block: Block
+
+
+@dataclass
+class Schema:
+    text: str
+    blocks: list
+    models: dict
+    enums: dict
+
+    def model_for_table(self, table):
+        """Model backing a database table (honours @@map)"""
+        for model in self.models.values():
+            if model.table == table:
+                return model
+        return None
+
+    def relation_fields(self, model):
+        """Fields of a model that point at another model"""
+        return [f for f in model.fields if f.type in self.models]
+
+    def scalar_fields(self, model):
+        """Fields stored as columns (scalars and enums)"""
+        return [f for f in model.fields if f.type not in self.models]
+
+
+def strip_comment(line):
+    """Split a line into (code, comment), ignoring '//' inside string literals"""
+    in_string = False
+    for i, char in enumerate(line):
+        if char == '"' and (i == 0 or line[i - 1] != '\\'):
+            in_string = not in_string
+        elif not in_string and line.startswith('//', i):
+            return line[:i].rstrip(), line[i + 2:].strip()
+    return line.rstrip(), ''
+
+
+def split_top_level(text, separator=','):
+    """Split on separators not nested in brackets, parentheses or strings"""
+    parts, depth, in_string, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            in_string = not in_string
+        elif not in_string and char in '([{':
+            depth += 1
+        elif not in_string and char in ')]}':
+            depth -= 1
+        if char == separator and depth == 0 and not in_string:
+            parts.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    if ''.join(current).strip():
+        parts.append(''.join(current).strip())
+    return parts
+
+
+def attribute_arguments(attributes, name):
+    """Raw argument text of the first @name(...) / @@name(...) occurrence"""
+    start = attributes.find(name + '(')
+    if start == -1:
+        return None
+    depth = 0
+    for i in range(start + len(name), len(attributes)):
+        if attributes[i] == '(':
+            depth += 1
+        elif attributes[i] == ')':
+            depth -= 1
+            if depth == 0:
+                return attributes[start + len(name) + 1:i]
+    return None
+
+
+def bracket_list(text):
+    """Field names from the first [...] in text, without (sort: Desc)-style suffixes"""
+    start = text.find('[')
+    end = text.find(']', start)
+    if start == -1 or end == -1:
+        return []
+    return [re.sub(r'\(.*\)$', '', item).strip() for item in split_top_level(text[start + 1:end])]
+
+
+def split_blocks(text):
+    """Top-level blocks with their line spans"""
+    lines = text.split('\n')
+    blocks = []
+    i = 0
+    while i < len(lines):
+        match = BLOCK_START_PATTERN.match(lines[i])
+        if not match:
+            i += 1
+            continue
+        end = i + 1
+        while end < len(lines) and lines[end].strip() != '}':
+            end += 1
+        blocks.append(Block(
+            kind=match.group(1),
+            name=match.group(2),
+            start_line=i,
+            end_line=end,
+            text='\n'.join(lines[i:end + 1]),
+        ))
+        i = end + 1
+    return blocks
+
+
+def parse_field(code, comment):
+    parts = code.split(None, 2)
+    name, type_token = parts[0], parts[1]
+    attributes = parts[2] if len(parts) > 2 else ''
+
+    field = Field(name=name, type=type_token.rstrip('?').replace('[]', ''),
+                  optional=type_token.endswith('?'), is_list='[]' in type_token,
+                  attributes=attributes, comment=comment, column=name)
+
+    map_match = MAP_PATTERN.search(attributes)
+    if map_match:
+        field.column = map_match.group(1)
+    native_match = NATIVE_TYPE_PATTERN.search(attributes)
+    if native_match:
+        field.native_type = native_match.group(1)
+        field.native_args = native_match.group(2) or ''
+    field.default = attribute_arguments(attributes, '@default')
+    field.is_id = re.search(r'@id\b', attributes) is not None
+    field.is_unique = re.search(r'@unique\b', attributes) is not None
+
+    relation = attribute_arguments(attributes, '@relation')
+    if relation:
+        for argument in split_top_level(relation):
+            if argument.startswith('fields:'):
+                field.relation_fields = bracket_list(argument)
+            elif argument.startswith('references:'):
+                field.relation_references = bracket_list(argument)
+    return field
+
+
+def parse_block_index(kind, code):
+    arguments = attribute_arguments(code, '@@' + kind) or ''
+    name_match = INDEX_NAME_PATTERN.search(arguments)
+    type_match = INDEX_TYPE_PATTERN.search(arguments)
+    return Index(kind=kind, fields=bracket_list(arguments),
+                 name=name_match.group(1) if name_match else '',
+                 type=type_match.group(1) if type_match else '', raw=code.strip())
+
+
+def parse_model(block):
+    fields, indexes, table = [], [], block.name
+    for line in block.text.split('\n')[1:-1]:
+        code, comment = strip_comment(line)
+        stripped = code.strip()
+        if not stripped:
+            continue
+        if stripped.startswith('@@'):
+            kind = stripped[2:].split('(', 1)[0]
+            if kind in ('index', 'unique', 'id'):
+                indexes.append(parse_block_index(kind, stripped))
+            elif kind == 'map':
+                table = BLOCK_MAP_PATTERN.search(stripped).group(1)
+            continue
+        fields.append(parse_field(stripped, comment))
+
+    # Field-level @id/@unique are indexes too
+    for f in fields:
+        if f.is_id:
+            indexes.append(Index(kind='id', fields=[f.name], raw=f'{f.name} @id'))
+        elif f.is_unique:
+            indexes.append(Index(kind='unique', fields=[f.name], raw=f'{f.name} @unique'))
+
+    return Model(name=block.name, table=table, fields=fields, indexes=indexes, block=block)
+
+
+def parse_enum(block):
+    values, db_name = [], block.name
+    for line in block.text.split('\n')[1:-1]:
+        code, _ = strip_comment(line)
+        stripped = code.strip()
+        if not stripped:
+            continue
+        if stripped.startswith('@@map'):
+            db_name = BLOCK_MAP_PATTERN.search(stripped).group(1)
+        elif not stripped.startswith('@@'):
+            values.append(stripped.split()[0])
+    return Enum(name=block.name, values=values, db_name=db_name, block=block)
+
+
+def parse_schema(text):
+    blocks = split_blocks(text)
+    models, enums = {}, {}
+    for block in blocks:
+        if block.kind == 'model':
+            models[block.name] = parse_model(block)
+        elif block.kind == 'enum':
+            enums[block.name] = parse_enum(block)
+    return Schema(text=text, blocks=blocks, models=models, enums=enums)
+
+
+def load_schema(schema_path):
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        return parse_schema(f.read())
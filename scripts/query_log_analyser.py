@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Prisma Query Log Analyser
+Streams Prisma query logs (winston JSON lines or "Query:/Duration:" text, optionally
+gzipped) and pg_stat_statements CSV exports, fingerprints the SQL, and maps each
+predicate and ORDER BY column back onto schema.prisma models and fields. Hot
+queries that no declared index can serve are flagged with a proposed @@index.
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import re
+import sys
+
+from prisma_schema import load_schema
+from tools_config import load_config
+import tool_metrics
+
+SAMPLE_LENGTH = 500
+MAX_PROPOSED_COLUMNS = 4
+
+COMMENT_PATTERN = re.compile(r'/\*.*?\*/|--[^\n]*', re.DOTALL)
+STRING_PATTERN = re.compile(r"'(?:[^']|'')*'")
+PARAM_PATTERN = re.compile(r'\$\d+')
+NUMBER_PATTERN = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST_PATTERN = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+VALUES_PATTERN = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+IDENT = r'(?:"[^"]+"|[A-Za-z_]\w*)'
+TABLE_PATTERN = re.compile(
+    rf'\b(?:FROM|JOIN|UPDATE|INTO)\s+({IDENT}(?:\.{IDENT})?)(?:\s+(?:AS\s+)?({IDENT}))?',
+    re.IGNORECASE,
+)
+PREDICATE_PATTERN = re.compile(
+    rf'({IDENT}(?:\.{IDENT}){{0,2}})\s*(=|>=|<=|<>|!=|>|<|\bNOT\s+IN\b|\bIN\b|\bIS\b|\bI?LIKE\b|\bBETWEEN\b)',
+    re.IGNORECASE,
+)
+# Keywords that open (WHERE/ON/HAVING) or close a clause; predicates are only read inside the former
+CLAUSE_PATTERN = re.compile(
+    r'\b(WHERE|ON|HAVING|GROUP\s+BY|ORDER\s+BY|LIMIT|OFFSET|RETURNING|UNION|INTERSECT|EXCEPT|FOR|'
+    r'JOIN|SET|FROM|SELECT|VALUES|USING)\b',
+    re.IGNORECASE,
+)
+PREDICATE_CLAUSES = {'where', 'on', 'having'}
+QUOTED_IDENT_PATTERN = re.compile(r'"[^"]*"')
+ORDER_BY_PATTERN = re.compile(r'\bORDER\s+BY\s+(.+?)(?:\bLIMIT\b|\bOFFSET\b|\bFOR\b|\)|$)', re.IGNORECASE)
+DURATION_PATTERN = re.compile(r'Duration:\s*(\d+(?:\.\d+)?)\s*ms')
+
+SQL_KEYWORDS = {
+    'where', 'on', 'inner', 'left', 'right', 'full', 'cross', 'join', 'set', 'order', 'group',
+    'limit', 'offset', 'returning', 'values', 'using', 'and', 'or', 'not', 'select', 'as',
+}
+EQUALITY_OPERATORS = {'=', 'in', 'is'}
+RANGE_OPERATORS = {'>', '<', '>=', '<=', 'like', 'ilike', 'between'}
+
+
+# ======================
+# READING
+# ======================
+
+def open_log(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def read_prisma_log(lines):
+    """Yield (sql, duration_ms, calls) from Prisma query log lines"""
+    pending = None
+    for line in lines:
+        if '"query"' in line and '{' in line:
+            try:
+                event = json.loads(line[line.index('{'):])
+            except ValueError:
+                event = None
+            if isinstance(event, dict) and event.get('query'):
+                duration = str(event.get('duration', 0)).rstrip('ms') or 0
+                yield event['query'], float(duration), 1
+                continue
+
+        message = line
+        if line.lstrip().startswith('{'):
+            try:
+                message = json.loads(line).get('message', '')
+            except (ValueError, AttributeError):
+                continue
+
+        if 'Query: ' in message or 'prisma:query ' in message:
+            if pending is not None:
+                yield pending, 0.0, 1
+            marker = 'Query: ' if 'Query: ' in message else 'prisma:query '
+            pending = message.split(marker, 1)[1].strip()
+            continue
+
+        duration_match = DURATION_PATTERN.search(message)
+        if duration_match and pending is not None:
+            yield pending, float(duration_match.group(1)), 1
+            pending = None
+
+    if pending is not None:
+        yield pending, 0.0, 1
+
+
+def read_pg_stat_statements(handle):
+    """Yield (sql, total_ms, calls) from a pg_stat_statements CSV export"""
+    csv.field_size_limit(sys.maxsize)
+    for row in csv.DictReader(handle):
+        calls = int(float(row.get('calls') or 0))
+        total = row.get('total_exec_time') or row.get('total_time')
+        if total is None and row.get('mean_exec_time'):
+            total = float(row['mean_exec_time']) * calls
+        yield row['query'], float(total or 0), calls
+
+
+def read_events(path):
+    """Stream query events from one file, detecting its format from the first line"""
+    with open_log(path) as handle:
+        first = handle.readline()
+        header = [column.strip().strip('"').lower() for column in first.split(',')]
+        handle.seek(0)
+        if 'query' in header and 'calls' in header:
+            yield from read_pg_stat_statements(handle)
+        else:
+            yield from read_prisma_log(handle)
+
+
+# ======================
+# FINGERPRINTS
+# ======================
+
+def fingerprint(sql):
+    """Normalise literals, parameters and list lengths so equivalent queries collapse"""
+    sql = COMMENT_PATTERN.sub(' ', sql)
+    sql = STRING_PATTERN.sub('?', sql)
+    sql = PARAM_PATTERN.sub('?', sql)
+    sql = NUMBER_PATTERN.sub('?', sql)
+    sql = IN_LIST_PATTERN.sub('IN (?)', sql)
+    sql = VALUES_PATTERN.sub('(...)', sql)
+    return WHITESPACE_PATTERN.sub(' ', sql).strip()
+
+
+def aggregate(paths):
+    """Count and time per fingerprint across all files, in one streaming pass"""
+    stats = {}
+    for path in paths:
+        tool_metrics.count('files')
+        for sql, duration_ms, calls in read_events(path):
+            tool_metrics.count('events')
+            key = fingerprint(sql)
+            entry = stats.get(key)
+            if entry is None:
+                entry = stats[key] = {'fingerprint': key, 'calls': 0, 'total_ms': 0.0}
+            entry['calls'] += calls
+            entry['total_ms'] += duration_ms
+    for entry in stats.values():
+        entry['mean_ms'] = entry['total_ms'] / entry['calls'] if entry['calls'] else 0.0
+    return stats
+
+
+# ======================
+# SCHEMA MAPPING
+# ======================
+
+def unquote(identifier):
+    return identifier.strip('"')
+
+
+def referenced_tables(sql):
+    """alias/table name -> table name for every FROM/JOIN/UPDATE/INTO target"""
+    tables = {}
+    for match in TABLE_PATTERN.finditer(sql):
+        table = unquote(match.group(1).split('.')[-1])
+        tables[table] = table
+        alias = match.group(2)
+        if alias and unquote(alias).lower() not in SQL_KEYWORDS:
+            tables[unquote(alias)] = table
+    return tables
+
+
+def resolve_column(reference, tables, schema):
+    """(model, field) for a column reference, or None if it isn't a schema column"""
+    parts = [unquote(p) for p in re.findall(IDENT, reference)]
+    column = parts[-1]
+    if len(parts) > 1:
+        candidates = [tables.get(parts[-2], parts[-2])]
+    else:
+        candidates = list(dict.fromkeys(tables.values()))
+
+    for table in candidates:
+        model = schema.model_for_table(table)
+        if model is None:
+            continue
+        field = model.field_for_column(column)
+        if field is not None:
+            return model, field
+    return None
+
+
+def predicate_clauses(sql):
+    """Text of every WHERE, JOIN ... ON and HAVING clause (not SET assignments or select lists)"""
+    # Blank out quoted identifiers so a column named "limit" or "from" isn't read as a keyword
+    masked = QUOTED_IDENT_PATTERN.sub(lambda m: '"' + '_' * (len(m.group()) - 2) + '"', sql)
+    clauses = []
+    start = None
+    for match in CLAUSE_PATTERN.finditer(masked):
+        if start is not None:
+            clauses.append(sql[start:match.start()])
+        keyword = WHITESPACE_PATTERN.sub(' ', match.group(1)).lower()
+        start = match.end() if keyword in PREDICATE_CLAUSES else None
+    if start is not None:
+        clauses.append(sql[start:])
+    return clauses
+
+
+def query_shape(sql, schema):
+    """Per model: equality, range and ORDER BY fields used by a fingerprint"""
+    if sql.lstrip().upper().startswith('INSERT'):
+        return {}
+    tables = referenced_tables(sql)
+    shapes = {}
+
+    def shape_for(model):
+        return shapes.setdefault(model.name, {'model': model, 'equality': [], 'range': [], 'order': []})
+
+    predicates = (match for clause in predicate_clauses(sql) for match in PREDICATE_PATTERN.finditer(clause))
+    for match in predicates:
+        operator = WHITESPACE_PATTERN.sub(' ', match.group(2)).lower()
+        if operator in EQUALITY_OPERATORS:
+            kind = 'equality'
+        elif operator in RANGE_OPERATORS:
+            kind = 'range'
+        else:
+            continue  # <>, != and NOT IN can't use a btree index
+        resolved = resolve_column(match.group(1), tables, schema)
+        if resolved:
+            model, field = resolved
+            bucket = shape_for(model)[kind]
+            if field.name not in bucket:
+                bucket.append(field.name)
+
+    order_match = ORDER_BY_PATTERN.search(sql)
+    if order_match:
+        for item in order_match.group(1).split(','):
+            reference = re.sub(r'\s+(ASC|DESC)\b.*$', '', item.strip(), flags=re.IGNORECASE)
+            resolved = resolve_column(reference, tables, schema)
+            if resolved:
+                model, field = resolved
+                bucket = shape_for(model)['order']
+                if field.name not in bucket:
+                    bucket.append(field.name)
+
+    return shapes
+
+
+def index_coverage(index_fields, shape):
+    """How many leading index columns the query can use (equalities, then one range/sort)"""
+    covered = 0
+    for column in index_fields:
+        if column in shape['equality']:
+            covered += 1
+            continue
+        if column in shape['range'] or column in shape['order']:
+            covered += 1
+        break
+    return covered
+
+
+def propose_index(shape):
+    """Equality, then sort, then range columns (the ESR rule)"""
+    columns = list(shape['equality'])
+    columns += [c for c in shape['order'] if c not in columns]
+    columns += [c for c in shape['range'][:1] if c not in columns]
+    return columns[:MAX_PROPOSED_COLUMNS]
+
+
+def evaluate_shape(shape):
+    """Best declared index for a query shape and, if it falls short, a proposal"""
+    model = shape['model']
+    best, best_coverage = None, 0
+    for index in model.indexes:
+        coverage = index_coverage(index.fields, shape)
+        if coverage > best_coverage:
+            best, best_coverage = index, coverage
+
+    proposal = propose_index(shape)
+    if best_coverage == 0:
+        status = 'no usable index'
+    elif best_coverage < index_coverage(proposal, shape):
+        status = 'partial'
+    else:
+        status = 'ok'
+    return {
+        'model': model.name,
+        'equality': shape['equality'],
+        'range': shape['range'],
+        'order': shape['order'],
+        'best_index': best.raw if best else None,
+        'status': status,
+        'proposal': proposal if status != 'ok' and proposal else None,
+    }
+
+
+def analyse(stats, schema, top):
+    """Rank fingerprints by total time and check the hottest against the schema's indexes"""
+    ranked = sorted(stats.values(), key=lambda e: (e['total_ms'], e['calls']), reverse=True)
+    hot = []
+    proposals = {}
+    for entry in ranked[:top]:
+        checks = [evaluate_shape(s) for s in query_shape(entry['fingerprint'], schema).values()
+                  if s['equality'] or s['range'] or s['order']]
+        hot.append({**entry, 'fingerprint': entry['fingerprint'][:SAMPLE_LENGTH], 'checks': checks})
+        for check in checks:
+            if check['proposal']:
+                key = (check['model'], tuple(check['proposal']))
+                proposal = proposals.setdefault(key, {
+                    'model': check['model'], 'fields': check['proposal'], 'calls': 0, 'total_ms': 0.0,
+                })
+                proposal['calls'] += entry['calls']
+                proposal['total_ms'] += entry['total_ms']
+    return {
+        'fingerprints': len(stats),
+        'hot': hot,
+        'proposals': sorted(proposals.values(), key=lambda p: p['total_ms'], reverse=True),
+    }
+
+
+# ======================
+# REPORT
+# ======================
+
+def print_report(report):
+    print(f"📊 {report['fingerprints']} distinct query fingerprints")
+    print(f"\n🔥 Top {len(report['hot'])} by total time:")
+    for rank, entry in enumerate(report['hot'], start=1):
+        print(f"\n{rank:>3}. {entry['calls']} calls, {entry['total_ms']:.1f} ms total, "
+              f"{entry['mean_ms']:.2f} ms mean")
+        print(f"     {entry['fingerprint'][:160]}")
+        for check in entry['checks']:
+            icon = {'ok': '✅', 'partial': '⚠️', 'no usable index': '❌'}[check['status']]
+            used = ', '.join(
+                f"{kind}={check[kind]}" for kind in ('equality', 'range', 'order') if check[kind]
+            )
+            print(f"     {icon} {check['model']}: {used} -> {check['best_index'] or 'no index'}")
+
+    if report['proposals']:
+        print("\n💡 Proposed indexes:")
+        for proposal in report['proposals']:
+            print(f"  model {proposal['model']}: @@index([{', '.join(proposal['fields'])}])"
+                  f"  // {proposal['calls']} calls, {proposal['total_ms']:.1f} ms")
+    else:
+        print("\n✅ Every hot query has a usable index")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Map Prisma/pg_stat_statements query logs onto schema.prisma indexes")
+    parser.add_argument('logs', nargs='+', help="Prisma query logs or pg_stat_statements CSV (.gz ok)")
+    parser.add_argument('--schema', default=None, help="Path to schema.prisma (default: from config)")
+    parser.add_argument('--top', type=int, default=20, help="Number of hottest fingerprints to check")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    parser.add_argument('--fail-on-missing', action='store_true',
+                        help="Exit 1 when a hot query has no usable index")
+    tool_metrics.add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def analyse_logs(args):
+    with tool_metrics.phase('parse'):
+        schema = load_schema(args.schema or load_config()['schema_path'])
+    with tool_metrics.phase('read'):
+        stats = aggregate(args.logs)
+    with tool_metrics.phase('categorise'):
+        report = analyse(stats, schema, args.top)
+    with tool_metrics.phase('write'):
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_report(report)
+    flagged = any(c['status'] == 'no usable index' for e in report["hot"] for c in e["checks"])
+    return 1 if flagged and args.fail_on_missing else 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tool_metrics.start_run('querylog', args)
+    try:
+        return analyse_logs(args)
+    finally:
+        tool_metrics.finish_run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
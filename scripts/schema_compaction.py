@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Schema Storage-Compaction Advisor
+Finds stringly-typed and oversized columns in schema.prisma, confirms them against
+sample rows (COPY text or CSV, with a header line), estimates the bytes each change
+saves and writes the schema patch plus migration SQL.
+
+Candidates:
+  - String columns acting as enums (comment lists values or *Type/*Status-style name)
+    -> Prisma enum (4 bytes per value instead of len + 1), when the sample holds at least
+    two values and the enum is smaller than the strings it replaces
+  - Json columns holding arrays of URLs -> child table, taking the array out of the hot row
+  - @db.Text on short values -> @db.VarChar(n) (same on-disk size in Postgres; bounds the column)
+"""
+
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+
+from prisma_schema import load_schema
+from tools_config import load_config
+import tool_metrics
+
+ENUM_NAME_PATTERN = re.compile(
+    r'(type|status|category|mode|method|kind|source|channel|unit|gender|severity|level|frequency|role)$',
+    re.IGNORECASE,
+)
+URL_FIELD_PATTERN = re.compile(r'(attachments|urls?|images|photos|files|documents|scans)$', re.IGNORECASE)
+COMMENT_VALUES_PATTERN = re.compile(r'"([^"]+)"')
+COMMENT_WORDS_PATTERN = re.compile(r'^\s*([A-Za-z][\w-]*(?:\s*,\s*[A-Za-z][\w-]*)+)\s*$')
+STRING_DEFAULT_PATTERN = re.compile(r'^"([^"]*)"$')
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z][A-Za-z0-9_]*$')
+URL_VALUE_PATTERN = re.compile(r'^(https?://|/)')
+
+DEFAULT_MAX_ENUM_VALUES = 20
+DEFAULT_MIN_SAMPLE_ROWS = 20
+MAX_VARCHAR = 255
+VARCHAR_SIZES = [32, 64, 128, 255]
+
+# Postgres storage constants used for estimates
+ENUM_BYTES = 4
+SHORT_VARLENA_LIMIT = 127
+TUPLE_OVERHEAD = 24 + 4  # heap tuple header + line pointer
+JSONB_CONTAINER_HEADER = 4
+JSONB_ENTRY_HEADER = 4
+
+
+# ======================
+# CANDIDATES
+# ======================
+
+def declared_values(field):
+    """Enum-like values listed in a field's trailing comment"""
+    quoted = COMMENT_VALUES_PATTERN.findall(field.comment)
+    if len(quoted) >= 2:
+        return quoted
+    words = COMMENT_WORDS_PATTERN.match(field.comment.replace(', etc.', '').replace(' etc.', ''))
+    if words:
+        return [w.strip() for w in words.group(1).split(',')]
+    return []
+
+
+def find_candidates(schema):
+    """Columns whose declared type looks wider than their content"""
+    candidates = []
+    for model in schema.models.values():
+        for field in schema.scalar_fields(model):
+            if field.is_list or field.is_id or field.is_unique:
+                continue
+            if field.type == 'String' and field.native_type == 'Text':
+                candidates.append({'model': model, 'field': field, 'kind': 'text', 'reason': '@db.Text'})
+            elif field.type == 'String':
+                values = declared_values(field)
+                default = STRING_DEFAULT_PATTERN.match(field.default or '')
+                if values:
+                    reason = f"comment lists {', '.join(values)}"
+                elif ENUM_NAME_PATTERN.search(field.name):
+                    reason = 'enum-like name'
+                else:
+                    continue
+                # The default must stay a valid value of the generated enum
+                declared = values + [default.group(1)] if default and default.group(1) not in values else values
+                candidates.append({'model': model, 'field': field, 'kind': 'enum',
+                                   'reason': reason, 'declared': declared})
+            elif field.type == 'Json' and (URL_FIELD_PATTERN.search(field.name) or 'url' in field.comment.lower()):
+                candidates.append({'model': model, 'field': field, 'kind': 'json_urls', 'reason': 'URL-list name'})
+    return candidates
+
+
+# ======================
+# SAMPLES
+# ======================
+
+def unescape_copy(value):
+    """Decode a COPY text-format field (\\N is NULL)"""
+    if value == '\\N':
+        return None
+    if '\\' not in value:
+        return value
+    return re.sub(r'\\(.)', lambda m: {'t': '\t', 'n': '\n', 'r': '\r'}.get(m.group(1), m.group(1)), value)
+
+
+def read_sample(path):
+    """Yield rows as dicts from a CSV or COPY text file with a header line"""
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as handle:
+        if path.endswith('.csv'):
+            import csv
+            csv.field_size_limit(sys.maxsize)
+            for row in csv.DictReader(handle):
+                yield {k: (v if v != '' else None) for k, v in row.items()}
+            return
+        header = handle.readline().rstrip('\n').split('\t')
+        for line in handle:
+            values = [unescape_copy(v) for v in line.rstrip('\n').split('\t')]
+            yield dict(zip(header, values))
+
+
+def sample_paths(args, schema):
+    """Model name -> sample file, from --sample Model=path and --samples-dir"""
+    paths = {}
+    if args.samples_dir:
+        for name in os.listdir(args.samples_dir):
+            stem = name.split('.', 1)[0]
+            model = schema.models.get(stem) or schema.model_for_table(stem)
+            if model:
+                paths[model.name] = os.path.join(args.samples_dir, name)
+    for item in args.sample:
+        name, path = item.split('=', 1)
+        model = schema.models.get(name) or schema.model_for_table(name)
+        if model is None:
+            raise ValueError(f"--sample names unknown model or table '{name}'")
+        paths[model.name] = path
+    return paths
+
+
+def new_profile():
+    return {'rows': 0, 'nulls': 0, 'missing': False, 'distinct': set(), 'overflow': False,
+            'bytes': 0, 'max_length': 0, 'url_arrays': 0, 'url_bytes': 0, 'urls': 0}
+
+
+def profile_samples(path, candidates, max_enum_values):
+    """One pass over a sample file, profiling every candidate column of its model"""
+    profiles = {c['field'].name: new_profile() for c in candidates}
+    columns = {c['field'].name: c['field'].column for c in candidates}
+    for row in read_sample(path):
+        tool_metrics.count('rows')
+        for name, profile in profiles.items():
+            if columns[name] not in row:
+                # Absent from the header: no evidence either way, not a column of NULLs
+                profile['missing'] = True
+                continue
+            value = row[columns[name]]
+            profile['rows'] += 1
+            if value is None:
+                profile['nulls'] += 1
+                continue
+            size = len(value.encode('utf-8'))
+            profile['bytes'] += size
+            profile['max_length'] = max(profile['max_length'], len(value))
+            if not profile['overflow']:
+                profile['distinct'].add(value)
+                # Stop tracking once it clearly isn't an enum; keeps memory bounded
+                profile['overflow'] = len(profile['distinct']) > max_enum_values
+            if value.startswith('['):
+                try:
+                    parsed = json.loads(value)
+                except ValueError:
+                    continue
+                if isinstance(parsed, list) and all(isinstance(u, str) and URL_VALUE_PATTERN.match(u) for u in parsed):
+                    profile['url_arrays'] += 1
+                    profile['urls'] += len(parsed)
+                    profile['url_bytes'] += sum(len(u.encode('utf-8')) for u in parsed)
+    return profiles
+
+
+# ======================
+# EVALUATION
+# ======================
+
+def varlena_bytes(length):
+    return length + (1 if length < SHORT_VARLENA_LIMIT else 4)
+
+
+def indexes_on(model, field):
+    return sum(1 for index in model.indexes if field.name in index.fields)
+
+
+def evaluate(candidate, profile, options):
+    """Confirm or reject a candidate and estimate bytes saved per row"""
+    field, model = candidate['field'], candidate['model']
+    result = {**candidate, 'status': 'unconfirmed', 'rows': 0, 'saved_per_row': 0.0,
+              'index_count': indexes_on(model, field), 'values': list(candidate.get('declared', []))}
+    if profile is not None and profile['missing']:
+        result['note'] = f"column {field.column} not in the sample"
+    if profile is None or profile['rows'] == 0:
+        return result
+
+    non_null = profile['rows'] - profile['nulls']
+    result['rows'] = profile['rows']
+    avg_length = profile['bytes'] / non_null if non_null else 0
+
+    if candidate['kind'] == 'enum':
+        values = sorted(set(result['values']) | profile['distinct'])
+        if profile['overflow']:
+            result['status'] = 'rejected'
+            result['note'] = f"more than {options.max_enum_values} distinct values"
+        elif non_null >= options.min_rows:
+            per_value = varlena_bytes(avg_length) - ENUM_BYTES
+            saved_per_row = per_value * non_null / profile['rows'] * (1 + result['index_count'])
+            if len(values) < 2:
+                result['status'] = 'rejected'
+                result['note'] = f"only {len(values)} distinct value(s)"
+            elif saved_per_row <= 0:
+                result['status'] = 'rejected'
+                result['note'] = f"values average {avg_length:.1f} bytes, no smaller than a {ENUM_BYTES}-byte enum"
+            else:
+                result['status'] = 'confirmed'
+                result['values'] = values
+                result['saved_per_row'] = saved_per_row
+    elif candidate['kind'] == 'json_urls':
+        if non_null and profile['url_arrays'] == non_null:
+            result['status'] = 'confirmed'
+            urls_per_row = profile['urls'] / non_null
+            jsonb_size = (JSONB_CONTAINER_HEADER + urls_per_row * JSONB_ENTRY_HEADER
+                          + profile['url_bytes'] / non_null)
+            result['saved_per_row'] = varlena_bytes(jsonb_size) * non_null / profile['rows']
+            # Each URL becomes a child row: tuple overhead, two ids, the URL and its position
+            child_row = TUPLE_OVERHEAD + 2 * varlena_bytes(25) + 4 + varlena_bytes(profile['url_bytes'] / max(profile['urls'], 1))
+            result['child_bytes_per_row'] = urls_per_row * child_row * non_null / profile['rows']
+        elif non_null:
+            result['status'] = 'rejected'
+            result['note'] = 'not every value is an array of URLs'
+    elif candidate['kind'] == 'text':
+        if non_null and profile['max_length'] <= MAX_VARCHAR:
+            result['status'] = 'confirmed'
+            result['varchar'] = next(size for size in VARCHAR_SIZES if size >= min(profile['max_length'] * 2, MAX_VARCHAR))
+            result['note'] = (f"same on-disk size in Postgres; sized from a sample maximum of {profile['max_length']} "
+                              f"characters, so longer live rows will fail the migration")
+        elif non_null:
+            result['status'] = 'rejected'
+            result['note'] = f"values up to {profile['max_length']} characters"
+    return result
+
+
+# ======================
+# PATCH + MIGRATION
+# ======================
+
+def enum_identifier(value):
+    if IDENTIFIER_PATTERN.match(value):
+        return value
+    return re.sub(r'[^A-Za-z0-9]+', '_', value).strip('_').upper() or 'EMPTY'
+
+
+def upper_first(name):
+    return name[0].upper() + name[1:]
+
+
+def lower_first(name):
+    return name[0].lower() + name[1:]
+
+
+def enum_block(name, values):
+    lines = [f"enum {name} {{"]
+    for value in values:
+        identifier = enum_identifier(value)
+        lines.append(f"  {identifier}" if identifier == value else f'  {identifier} @map("{value}")')
+    lines.append("}")
+    return '\n'.join(lines)
+
+
+def child_model_block(child, model, field_name):
+    parent_field = lower_first(model.name)
+    rows = [
+        ('id', 'String', '@id @default(cuid())'),
+        (f'{parent_field}Id', 'String', ''),
+        ('url', 'String', ''),
+        ('position', 'Int', ''),
+        (parent_field, model.name, f'@relation(fields: [{parent_field}Id], references: [id], onDelete: Cascade)'),
+    ]
+    name_width = max(len(r[0]) for r in rows)
+    type_width = max(len(r[1]) for r in rows)
+    lines = [f"model {child} {{"]
+    lines += [f"  {name.ljust(name_width)} {type_.ljust(type_width)} {attrs}".rstrip() for name, type_, attrs in rows]
+    lines += ["", f"  @@index([{parent_field}Id])", "}"]
+    return '\n'.join(lines)
+
+
+def unique_name(base, schema, taken):
+    name, suffix = base, 2
+    while name in schema.models or name in schema.enums or name in taken:
+        name, suffix = f"{base}{suffix}", suffix + 1
+    return name
+
+
+def retype(line, field_name, new_type):
+    """Replace a field line's type token, keeping the attribute column where it was"""
+    prefix, token, gap, rest = re.match(rf'(\s+{field_name}\s+)(\S+)(\s*)(.*)$', line).groups()
+    if not rest:
+        return prefix + new_type
+    return prefix + new_type + ' ' * max(1, len(token) + len(gap) - len(new_type)) + rest
+
+
+def build_changes(results, schema):
+    """Schema line edits, new blocks and migration SQL for the accepted results"""
+    lines = schema.text.split('\n')
+    new_blocks, sql, taken = [], [], set()
+
+    for step, result in enumerate(results, start=1):
+        model, field = result['model'], result['field']
+        line_no = next(i for i in range(model.block.start_line, model.block.end_line)
+                       if re.match(rf'\s+{field.name}\s', lines[i]))
+        line = lines[line_no]
+        table, column = model.table, field.column
+        sql.append(f"-- Step {step}: {model.name}.{field.name} ({result['kind']})")
+
+        if result['kind'] == 'enum':
+            enum_name = unique_name(f"{model.name}{upper_first(field.name)}", schema, taken)
+            taken.add(enum_name)
+            new_blocks.append(enum_block(enum_name, result['values']))
+            lines[line_no] = retype(line, field.name, enum_name + ('?' if field.optional else ''))
+            default = STRING_DEFAULT_PATTERN.match(field.default or '')
+            if default:
+                lines[line_no] = lines[line_no].replace(
+                    f'@default("{default.group(1)}")', f'@default({enum_identifier(default.group(1))})')
+            labels = ', '.join("'" + v.replace("'", "''") + "'" for v in result['values'])
+            sql.append(f'DO $$ BEGIN CREATE TYPE "{enum_name}" AS ENUM ({labels}); '
+                       f'EXCEPTION WHEN duplicate_object THEN null; END $$;')
+            if default:
+                sql.append(f'ALTER TABLE "{table}" ALTER COLUMN "{column}" DROP DEFAULT;')
+            sql.append(f'ALTER TABLE "{table}" ALTER COLUMN "{column}" TYPE "{enum_name}" '
+                       f'USING ("{column}"::"{enum_name}");')
+            if default:
+                sql.append(f"ALTER TABLE \"{table}\" ALTER COLUMN \"{column}\" SET DEFAULT '{default.group(1)}';")
+
+        elif result['kind'] == 'json_urls':
+            child = unique_name(f"{model.name}{upper_first(field.name).rstrip('s')}", schema, taken)
+            taken.add(child)
+            child_table = child
+            parent_column = f"{lower_first(model.name)}Id"
+            new_blocks.append(child_model_block(child, model, field.name))
+            lines[line_no] = retype(line, field.name, f"{child}[]")
+            sql += [
+                f'CREATE TABLE IF NOT EXISTS "{child_table}" ("id" TEXT NOT NULL, "{parent_column}" TEXT NOT NULL, '
+                f'"url" TEXT NOT NULL, "position" INTEGER NOT NULL, CONSTRAINT "{child_table}_pkey" PRIMARY KEY ("id"));',
+                f'CREATE INDEX IF NOT EXISTS "{child_table}_{parent_column}_idx" ON "{child_table}"("{parent_column}");',
+                f'INSERT INTO "{child_table}" ("id", "{parent_column}", "url", "position")',
+                'SELECT gen_random_uuid()::text, t."id", e.url, (e.position - 1)::int',
+                f'FROM "{table}" t, jsonb_array_elements_text(t."{column}"::jsonb) WITH ORDINALITY AS e(url, position)',
+                f'WHERE jsonb_typeof(t."{column}"::jsonb) = \'array\';',
+                f'ALTER TABLE "{table}" DROP COLUMN "{column}";',
+            ]
+
+        elif result['kind'] == 'text':
+            lines[line_no] = line.replace('@db.Text', f"@db.VarChar({result['varchar']})")
+            # Fail with a readable message when live rows outgrow the sample-based size
+            sql.append(f'DO $$ BEGIN IF EXISTS (SELECT 1 FROM "{table}" WHERE length("{column}") > {result["varchar"]}) '
+                       f'THEN RAISE EXCEPTION \'{table}.{column} has values longer than {result["varchar"]} characters\'; '
+                       f'END IF; END $$;')
+            sql.append(f'ALTER TABLE "{table}" ALTER COLUMN "{column}" TYPE VARCHAR({result["varchar"]});')
+        sql.append('')
+
+    patched = '\n'.join(lines).rstrip('\n') + '\n'
+    if new_blocks:
+        patched += '\n' + '\n\n'.join(new_blocks) + '\n'
+    return patched, '\n'.join(sql)
+
+
+# ======================
+# REPORT
+# ======================
+
+def parse_row_counts(items):
+    counts = {}
+    for item in items:
+        name, value = item.split('=', 1)
+        counts[name] = int(value)
+    return counts
+
+
+def print_report(results, row_counts):
+    by_status = {}
+    for result in results:
+        by_status.setdefault(result['status'], []).append(result)
+
+    print(f"🔎 {len(results)} candidates: " + ', '.join(f"{len(v)} {k}" for k, v in sorted(by_status.items())))
+    total_saved = 0.0
+    for result in by_status.get('confirmed', []):
+        model, field = result['model'], result['field']
+        rows = row_counts.get(model.name, result['rows'])
+        saved = result['saved_per_row'] * rows
+        total_saved += saved
+        detail = {
+            'enum': f"{len(result['values'])} values: {', '.join(result['values'][:8])}",
+            'json_urls': f"moves {result['saved_per_row']:.0f} B/row out of the hot row "
+                         f"(child table adds {result.get('child_bytes_per_row', 0):.0f} B/row)",
+            'text': f"-> VarChar({result.get('varchar')})",
+        }[result['kind']]
+        print(f"  ✅ {model.name}.{field.name} [{result['kind']}] {detail}")
+        print(f"     {result['saved_per_row']:.1f} B/row incl. {result['index_count']} index(es) "
+              f"x {rows} rows = {saved / 1024:.1f} KiB" + (f" ({result['note']})" if result.get('note') else ''))
+    for result in by_status.get('rejected', []):
+        print(f"  ❌ {result['model'].name}.{result['field'].name} [{result['kind']}]: {result['note']}")
+    unconfirmed = by_status.get('unconfirmed', [])
+    if unconfirmed:
+        print(f"  ℹ️  {len(unconfirmed)} unconfirmed (no or too few sampled values), e.g. "
+              + ', '.join(f"{r['model'].name}.{r['field'].name}" for r in unconfirmed[:6]))
+    print(f"\n💾 Estimated saving: {total_saved / (1024 * 1024):.2f} MiB")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Find stringly-typed and oversized columns in schema.prisma")
+    parser.add_argument('--schema', default=None, help="Path to schema.prisma (default: from config)")
+    parser.add_argument('--sample', action='append', default=[], metavar='MODEL=PATH',
+                        help="Sample rows for a model/table (CSV or COPY text with header; repeatable)")
+    parser.add_argument('--samples-dir', help="Directory of <Model or table>.csv/.tsv sample files")
+    parser.add_argument('--rows', action='append', default=[], metavar='MODEL=N',
+                        help="Real row count to extrapolate savings to (default: sample size)")
+    parser.add_argument('--max-enum-values', type=int, default=DEFAULT_MAX_ENUM_VALUES)
+    parser.add_argument('--min-rows', type=int, default=DEFAULT_MIN_SAMPLE_ROWS,
+                        help="Sample rows needed before a String column is confirmed as an enum")
+    parser.add_argument('--include-unconfirmed', action='store_true',
+                        help="Also patch comment-declared enums that have no sample")
+    parser.add_argument('--patch-out', help="Write the schema.prisma diff here")
+    parser.add_argument('--sql-out', help="Write the migration SQL here")
+    tool_metrics.add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def advise(args):
+    schema_path = args.schema or load_config()['schema_path']
+    with tool_metrics.phase('parse'):
+        schema = load_schema(schema_path)
+        candidates = find_candidates(schema)
+
+    with tool_metrics.phase('read'):
+        profiles = {}
+        for model_name, path in sample_paths(args, schema).items():
+            tool_metrics.count('files')
+            model_candidates = [c for c in candidates if c['model'].name == model_name]
+            if model_candidates:
+                profiles[model_name] = profile_samples(path, model_candidates, args.max_enum_values)
+
+    with tool_metrics.phase('categorise'):
+        results = [
+            evaluate(c, profiles.get(c['model'].name, {}).get(c['field'].name), args)
+            for c in candidates
+        ]
+
+    print_report(results, parse_row_counts(args.rows))
+
+    # An enum is only ever generated with at least two values
+    accepted = [r for r in results if (r['status'] == 'confirmed' and (r['kind'] != 'enum' or len(r['values']) >= 2))
+                or (args.include_unconfirmed and r['status'] == 'unconfirmed' and r['kind'] == 'enum'
+                    and len(r['values']) >= 2)]
+    if not (args.patch_out or args.sql_out):
+        return 0
+    with tool_metrics.phase('write'):
+        patched, sql = build_changes(accepted, schema)
+        if args.patch_out:
+            diff = difflib.unified_diff(schema.text.splitlines(keepends=True), patched.splitlines(keepends=True),
+                                        fromfile='a/' + os.path.basename(schema_path),
+                                        tofile='b/' + os.path.basename(schema_path))
+            with open(args.patch_out, 'w') as f:
+                f.writelines(diff)
+            print(f"✅ Schema patch written: {args.patch_out}")
+        if args.sql_out:
+            with open(args.sql_out, 'w') as f:
+                f.write("-- STORAGE COMPACTION: generated by hoperx-tools compaction\n"
+                        "-- Review before applying; enum casts fail if live data has values the sample didn't,\n"
+                        "-- and VarChar sizes come from the sample's longest value\n\n")
+                f.write(sql)
+            print(f"✅ Migration SQL written: {args.sql_out}")
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tool_metrics.start_run('compaction', args)
+    try:
+        return advise(args)
+    finally:
+        tool_metrics.finish_run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Schema Edit
+Safe read-modify-write of schema.prisma for scripts and CI jobs running side by side.
+Edits are computed from a snapshot of the file, then committed under an advisory lock:
+if the file's sha256 still matches the snapshot it is replaced atomically, otherwise our
+changes and the concurrent ones are merged three-way per model/enum block.
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from prisma_schema import split_blocks
+from tools_config import load_config
+import tool_metrics
+
+LOCK_SUFFIX = '.lock'
+LOCK_TIMEOUT_SECONDS = 60
+LOCK_POLL_SECONDS = 0.1
+TRAILER_KEY = ('trailer', '', 0)
+
+
+class SchemaEditError(RuntimeError):
+    pass
+
+
+class SchemaLockTimeout(SchemaEditError):
+    pass
+
+
+class SchemaMergeConflict(SchemaEditError):
+    def __init__(self, keys):
+        self.keys = keys
+        super().__init__("conflicting edits to " + ', '.join(unit_label(key) for key in keys))
+
+
+# ======================
+# LOCKING AND WRITING
+# ======================
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def read_schema(schema_path):
+    with open(schema_path, 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def try_lock(handle):
+    """Non-blocking exclusive lock; False while another process holds it"""
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+        try:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def unlock(handle):
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def schema_lock(schema_path, timeout=LOCK_TIMEOUT_SECONDS):
+    """Advisory lock on a sidecar file (the schema itself is replaced, so its inode can't carry the lock)"""
+    handle = open(schema_path + LOCK_SUFFIX, 'a+')
+    try:
+        deadline = time.monotonic() + timeout
+        while not try_lock(handle):
+            if time.monotonic() >= deadline:
+                raise SchemaLockTimeout(f"{schema_path} is locked by another editor (waited {timeout}s)")
+            time.sleep(LOCK_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            unlock(handle)
+    finally:
+        handle.close()
+
+
+def atomic_write(path, text):
+    """Write to a temp file beside the target and rename it over, so readers never see a partial schema"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+# ======================
+# THREE-WAY MERGE
+# ======================
+
+def unit_label(key):
+    kind, name, occurrence = key
+    if key == TRAILER_KEY:
+        return 'end of file'
+    return f"{kind} {name}" + (f" (copy {occurrence + 1})" if occurrence else '')
+
+
+def schema_units(text):
+    """Ordered (kind, name, occurrence) -> lines; each block carries the comments/blank lines above it"""
+    lines = text.split('\n')
+    units = {}
+    seen = {}
+    previous_end = -1
+    for block in split_blocks(text):
+        occurrence = seen.get((block.kind, block.name), 0)
+        seen[(block.kind, block.name)] = occurrence + 1
+        units[(block.kind, block.name, occurrence)] = lines[previous_end + 1:block.end_line + 1]
+        previous_end = block.end_line
+    units[TRAILER_KEY] = lines[previous_end + 1:]
+    return units
+
+
+def merge_schema(base, ours, theirs):
+    """Merge our edit of base with theirs per block; raise SchemaMergeConflict when both changed one block"""
+    base_units, our_units, their_units = schema_units(base), schema_units(ours), schema_units(theirs)
+
+    resolved, conflicts = {}, []
+    for key in {**their_units, **our_units}:
+        original, mine, other = base_units.get(key), our_units.get(key), their_units.get(key)
+        if mine == other or mine == original:
+            resolved[key] = other
+        elif other == original:
+            resolved[key] = mine
+        else:
+            conflicts.append(key)
+    if conflicts:
+        raise SchemaMergeConflict(conflicts)
+
+    # Their order is what is on disk; blocks only we added go after their predecessor in our text,
+    # or at the end of the file if the other side deleted that predecessor meanwhile
+    order = [key for key in their_units if resolved[key] is not None]
+    previous = None
+    for key in our_units:
+        if key not in their_units and resolved[key] is not None:
+            if previous is None:
+                position = 0
+            elif previous in order:
+                position = order.index(previous) + 1
+            else:
+                position = order.index(TRAILER_KEY)
+            order.insert(position, key)
+        previous = key
+
+    merged = []
+    for key in order:
+        merged.extend(resolved[key])
+    return '\n'.join(merged)
+
+
+# ======================
+# EDITING API
+# ======================
+
+def commit_schema(schema_path, base_text, new_text, timeout=LOCK_TIMEOUT_SECONDS):
+    """Write new_text (an edit of base_text) under the lock, merging if the file moved on meanwhile
+
+    Returns 'unchanged', 'written' or 'merged'.
+    """
+    if new_text == base_text:
+        return 'unchanged'
+
+    with schema_lock(schema_path, timeout):
+        current = read_schema(schema_path)
+        status = 'written'
+        if content_hash(current) != content_hash(base_text):
+            with tool_metrics.phase('merge'):
+                new_text = merge_schema(base_text, new_text, current)
+                tool_metrics.count('merges')
+            status = 'merged' if new_text != current else 'unchanged'
+        if status != 'unchanged':
+            with tool_metrics.phase('write'):
+                atomic_write(schema_path, new_text)
+        return status
+
+
+def edit_schema(schema_path, edit, timeout=LOCK_TIMEOUT_SECONDS):
+    """Apply edit(text) -> text to the schema safely; returns commit_schema's status"""
+    with tool_metrics.phase('read'):
+        base = read_schema(schema_path)
+    with tool_metrics.phase('parse'):
+        edited = edit(base)
+    return commit_schema(schema_path, base, edited, timeout)
+
+
+def find_block(text, kind, name):
+    for block in split_blocks(text):
+        if block.kind == kind and block.name == name:
+            return block
+    return None
+
+
+def add_blocks(text, fragment, after=None):
+    """Insert the fragment's blocks that text lacks, after the (kind, name) anchor or at the end
+
+    Returns (text, names of the blocks added).
+    """
+    existing = {(block.kind, block.name) for block in split_blocks(text)}
+    missing = [block for block in split_blocks(fragment) if (block.kind, block.name) not in existing]
+    if not missing:
+        return text, []
+
+    lines = text.split('\n')
+    anchor = find_block(text, *after) if after else None
+    if after and anchor is None:
+        raise SchemaEditError(f"{after[0]} {after[1]} not found")
+    position = anchor.end_line + 1 if anchor else len(lines)
+    if not anchor:
+        while position > 0 and not lines[position - 1].strip():
+            position -= 1
+
+    inserted = []
+    for block in missing:
+        inserted += [''] + block.text.split('\n')
+    lines[position:position] = inserted
+    return '\n'.join(lines), [block.name for block in missing]
+
+
+def remove_blocks(text, kind, name, keep_first=False):
+    """Drop every (or every later) occurrence of a block, the // comments directly above it
+    and the blank line after it
+
+    Returns (text, 1-based start lines of the removed blocks).
+    """
+    lines = text.split('\n')
+    matches = [block for block in split_blocks(text) if block.kind == kind and block.name == name]
+    removed = matches[1:] if keep_first else matches
+    for block in reversed(removed):
+        start = block.start_line
+        while start > 0 and lines[start - 1].lstrip().startswith('//'):
+            start -= 1
+        end = block.end_line + 1
+        if end < len(lines) and not lines[end].strip():
+            end += 1
+        del lines[start:end]
+    return '\n'.join(lines), [block.start_line + 1 for block in removed]
+
+
+def remove_duplicate_blocks(text):
+    """Keep the first of each repeated model/enum; returns (text, [(kind, name, line), ...])"""
+    seen, duplicates = set(), []
+    for block in split_blocks(text):
+        key = (block.kind, block.name)
+        if key in seen and key not in [(kind, name) for kind, name, _ in duplicates]:
+            duplicates.append((block.kind, block.name, block.start_line + 1))
+        seen.add(key)
+    for kind, name, _ in duplicates:
+        text, _ = remove_blocks(text, kind, name, keep_first=True)
+    return text, duplicates
+
+
+# ======================
+# MAIN
+# ======================
+
+def block_reference(value):
+    """'model:Name' (or bare 'Name' for a model) -> (kind, name)"""
+    kind, _, name = value.rpartition(':')
+    return (kind or 'model', name)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Edit schema.prisma under a lock, merging concurrent edits per block")
+    parser.add_argument('--schema', default=None, help="Path to schema.prisma (default: from config)")
+    parser.add_argument('--add', action='append', default=[], metavar='FRAGMENT',
+                        help="Add the models/enums of a .prisma fragment the schema lacks (repeatable)")
+    parser.add_argument('--after', type=block_reference, default=None, metavar='KIND:NAME',
+                        help="Insert added blocks after this block (default: end of file)")
+    parser.add_argument('--remove', action='append', default=[], type=block_reference, metavar='KIND:NAME',
+                        help="Remove a model/enum (repeatable)")
+    parser.add_argument('--dedupe', action='store_true', help="Remove repeated definitions, keeping the first")
+    parser.add_argument('--lock-timeout', type=float, default=LOCK_TIMEOUT_SECONDS,
+                        help=f"Seconds to wait for another editor's lock (default: {LOCK_TIMEOUT_SECONDS})")
+    tool_metrics.add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def run_edit(args):
+    schema_path = args.schema or load_config()['schema_path']
+    fragments = []
+    for path in args.add:
+        with open(path, 'r', encoding='utf-8') as f:
+            fragments.append(f.read())
+
+    def edit(text):
+        for fragment in fragments:
+            text, added = add_blocks(text, fragment, args.after)
+            for name in added:
+                print(f"➕ {name}")
+        for kind, name in args.remove:
+            text, removed = remove_blocks(text, kind, name)
+            if removed:
+                print(f"➖ {kind} {name} (line {', '.join(map(str, removed))})")
+        if args.dedupe:
+            text, duplicates = remove_duplicate_blocks(text)
+            for kind, name, line in duplicates:
+                print(f"➖ duplicate {kind} {name} from line {line}")
+        return text
+
+    try:
+        status = edit_schema(schema_path, edit, args.lock_timeout)
+    except SchemaEditError as e:
+        print(f"❌ {e}")
+        return 1
+    messages = {
+        'unchanged': "ℹ️  Schema already up to date",
+        'written': f"✅ Updated {schema_path}",
+        'merged': f"✅ Updated {schema_path} (merged with concurrent edits)",
+    }
+    print(messages[status])
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tool_metrics.start_run('edit', args)
+    try:
+        return run_edit(args)
+    finally:
+        tool_metrics.finish_run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Schema Usage Analyser
+Cross-references schema.prisma models, fields, enums and indexes against the backend
+source in a single Aho-Corasick pass, and reports what the code never reads or writes:
+dead and write-only models, unreferenced fields and enum values, and secondary indexes
+that only add write amplification.
+
+Usage is found by name, so dynamic access (data: req.body, computed keys) is invisible;
+treat the output as candidates to check, not a drop list to apply blindly.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from prisma_schema import load_schema
+from tools_config import load_config
+import tool_metrics
+
+SCAN_DIRS = ['repositories', 'services', 'controllers', 'jobs', 'workers']
+SOURCE_EXTENSIONS = ('.js', '.ts', '.mjs', '.cjs')
+IDENTIFIER_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$')
+
+READ_METHODS = {'findUnique', 'findUniqueOrThrow', 'findFirst', 'findFirstOrThrow', 'findMany',
+                'count', 'aggregate', 'groupBy'}
+WRITE_METHODS = {'create', 'createMany', 'createManyAndReturn', 'update', 'updateMany', 'upsert',
+                 'delete', 'deleteMany'}
+NESTED_WRITE_OPS = {'create', 'createMany', 'connectOrCreate', 'upsert', 'update', 'updateMany',
+                    'delete', 'deleteMany', 'set', 'connect', 'disconnect'}
+NESTED_READ_OPS = {'select', 'include', 'where', 'orderBy', 'take', 'skip', 'cursor', 'distinct',
+                   'some', 'every', 'none', 'is', 'isNot'}
+
+ACCESSOR_CALL_PATTERN = re.compile(r'\s*\.\s*(\w+)\s*\(')
+NESTED_PATTERN = re.compile(r'\s*:\s*(?:(true)\b|\{\s*(\w+))')
+AUTO_MANAGED_DEFAULTS = ('cuid(', 'uuid(', 'now()', 'autoincrement()')
+
+
+# ======================
+# MULTI-PATTERN SCAN
+# ======================
+
+class AhoCorasick:
+    """Finds every occurrence of every pattern in one left-to-right pass"""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pattern in patterns:
+            self._insert(pattern)
+        self._link()
+
+    def _insert(self, pattern):
+        state = 0
+        for char in pattern:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.output[state].append(pattern)
+
+    def _link(self):
+        """Breadth-first failure links; each state also reports the patterns of its suffixes"""
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, target in self.goto[state].items():
+                queue.append(target)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[target] = self.goto[fallback].get(char, 0)
+                self.output[target] = self.output[target] + self.output[self.fail[target]]
+
+    def search(self, text):
+        """Yield (start, pattern) for every match"""
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                for pattern in output[state]:
+                    yield position + 1 - len(pattern), pattern
+
+
+def is_whole_word(text, start, end):
+    return ((start == 0 or text[start - 1] not in IDENTIFIER_CHARS)
+            and (end == len(text) or text[end] not in IDENTIFIER_CHARS))
+
+
+# ======================
+# PATTERNS
+# ======================
+
+def accessor_name(model):
+    """Prisma client property for a model: the name with its first letter lowercased"""
+    return model.name[0].lower() + model.name[1:]
+
+
+def build_roles(schema):
+    """Pattern -> list of (role, target) telling what a hit on that text means"""
+    roles = {}
+
+    def add(pattern, role, target):
+        roles.setdefault(pattern, []).append((role, target))
+
+    for model in schema.models.values():
+        add(accessor_name(model), 'accessor', model.name)
+        add(f'"{model.table}"', 'raw', model.name)
+        for field in model.fields:
+            if field.type in schema.models:
+                add(field.name, 'relation', field.type)
+            else:
+                add(field.name, 'token', field.name)
+                if field.column != field.name:
+                    add(field.column, 'token', field.column)
+    for enum in schema.enums.values():
+        add(enum.name, 'token', enum.name)
+        for value in enum.values:
+            add(value, 'token', value)
+    return roles
+
+
+# ======================
+# SCAN
+# ======================
+
+def source_files(src_dir, dirs):
+    for directory in dirs:
+        for root, _, files in os.walk(os.path.join(src_dir, directory)):
+            for name in sorted(files):
+                if name.endswith(SOURCE_EXTENSIONS):
+                    yield os.path.join(root, name)
+
+
+def new_usage():
+    return {'read': set(), 'write': set(), 'raw': set(), 'nested_read': set(), 'nested_write': set()}
+
+
+def scan(paths, roles, src_dir):
+    """Model usage by kind (sets of files) and the files each plain token appears in"""
+    automaton = AhoCorasick(roles)
+    models, tokens = {}, {}
+
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        tool_metrics.count('files')
+        tool_metrics.count('bytes', len(text))
+        relative = os.path.relpath(path, src_dir)
+
+        for start, pattern in automaton.search(text):
+            end = start + len(pattern)
+            if pattern[0] != '"' and not is_whole_word(text, start, end):
+                continue
+            tool_metrics.count('matches')
+            for role, target in roles[pattern]:
+                if role == 'token':
+                    tokens.setdefault(target, set()).add(relative)
+                elif role == 'raw':
+                    models.setdefault(target, new_usage())['raw'].add(relative)
+                elif role == 'accessor' and start > 0 and text[start - 1] == '.':
+                    call = ACCESSOR_CALL_PATTERN.match(text, end)
+                    if call and call.group(1) in READ_METHODS:
+                        models.setdefault(target, new_usage())['read'].add(relative)
+                    elif call and call.group(1) in WRITE_METHODS:
+                        models.setdefault(target, new_usage())['write'].add(relative)
+                elif role == 'relation':
+                    nested = NESTED_PATTERN.match(text, end)
+                    if not nested:
+                        continue
+                    if nested.group(1) or nested.group(2) in NESTED_READ_OPS:
+                        models.setdefault(target, new_usage())['nested_read'].add(relative)
+                    elif nested.group(2) in NESTED_WRITE_OPS:
+                        models.setdefault(target, new_usage())['nested_write'].add(relative)
+    return models, tokens
+
+
+# ======================
+# ANALYSIS
+# ======================
+
+def model_status(usage):
+    reads = usage['read'] | usage['nested_read']
+    writes = usage['write'] | usage['nested_write']
+    if not (reads or writes or usage['raw']):
+        return 'unused'
+    if usage['raw'] and not (reads and writes):
+        return 'raw sql'  # direction unknown
+    if not reads:
+        return 'write-only'
+    if not writes:
+        return 'read-only'
+    return 'read/write'
+
+
+def auto_managed(field):
+    default = (field.default or '').strip()
+    return field.is_id or '@updatedAt' in field.attributes or default.startswith(AUTO_MANAGED_DEFAULTS)
+
+
+def unreferenced_fields(model, schema, tokens):
+    """Stored fields whose name (or mapped column) appears nowhere in the scanned code"""
+    return [f.name for f in schema.scalar_fields(model)
+            if not auto_managed(f) and f.name not in tokens and f.column not in tokens]
+
+
+def redundant_with(index, model):
+    """A longer or identical index on the same model that serves every lookup this one does"""
+    for other in model.indexes:
+        if other is index or len(other.fields) < len(index.fields):
+            continue
+        if other.fields[:len(index.fields)] == index.fields:
+            if len(other.fields) > len(index.fields) or model.indexes.index(other) < model.indexes.index(index):
+                return other
+    return None
+
+
+def index_findings(model, status, model_files, tokens):
+    """Secondary indexes that cost writes without serving any read the code makes"""
+    findings = []
+    for index in model.indexes:
+        if index.kind != 'index':
+            continue  # @id/@unique enforce constraints
+        label = f"@@index([{', '.join(index.fields)}])"
+        covering = redundant_with(index, model)
+        if status in ('unused', 'write-only'):
+            reason = f"model is {status}"
+        elif covering:
+            reason = f"prefix of {covering.raw or covering.fields}"
+        elif not (tokens.get(index.fields[0], set()) & model_files):
+            reason = f"leading field {index.fields[0]} never referenced with the model"
+        else:
+            continue
+        findings.append({'index': label, 'reason': reason})
+    return findings
+
+
+def analyse(schema, models_usage, tokens):
+    report = {'models': [], 'enums': [], 'totals': {}}
+    for model in schema.models.values():
+        usage = models_usage.get(model.name, new_usage())
+        status = model_status(usage)
+        files = set().union(*usage.values())
+        report['models'].append({
+            'model': model.name,
+            'status': status,
+            'files': len(files),
+            'unreferenced_fields': [] if status == 'unused' else unreferenced_fields(model, schema, tokens),
+            'droppable_indexes': index_findings(model, status, files, tokens),
+            'secondary_indexes': sum(1 for i in model.indexes if i.kind == 'index'),
+        })
+
+    for enum in schema.enums.values():
+        typed_fields = [f"{m.name}.{f.name}" for m in schema.models.values() for f in m.fields if f.type == enum.name]
+        report['enums'].append({
+            'enum': enum.name,
+            'referenced': enum.name in tokens,
+            'fields': typed_fields,
+            'unreferenced_values': [v for v in enum.values if v not in tokens],
+        })
+
+    statuses = [m['status'] for m in report['models']]
+    report['totals'] = {
+        'models': len(statuses),
+        **{status: statuses.count(status) for status in sorted(set(statuses))},
+        'unreferenced_fields': sum(len(m['unreferenced_fields']) for m in report['models']),
+        'droppable_indexes': sum(len(m['droppable_indexes']) for m in report['models']),
+        'secondary_indexes': sum(m['secondary_indexes'] for m in report['models']),
+        'unused_enums': sum(1 for e in report['enums'] if not e['referenced'] and not e['fields']),
+    }
+    return report
+
+
+# ======================
+# REPORT
+# ======================
+
+def print_report(report):
+    totals = report['totals']
+    models = report['models']
+
+    print(f"🔍 {totals['models']} models: " + ', '.join(
+        f"{totals[s]} {s}" for s in ('read/write', 'read-only', 'write-only', 'raw sql', 'unused') if s in totals))
+
+    for status, icon in (('unused', '❌'), ('write-only', '⚠️ '), ('read-only', 'ℹ️ ')):
+        names = [m['model'] for m in models if m['status'] == status]
+        if names:
+            print(f"\n{icon} {status.capitalize()} models ({len(names)}):")
+            for name in names:
+                print(f"  - {name}")
+
+    fields = [m for m in models if m['unreferenced_fields']]
+    if fields:
+        print(f"\n📊 Fields never referenced in code ({totals['unreferenced_fields']}):")
+        for m in fields:
+            print(f"  {m['model']}: {', '.join(m['unreferenced_fields'])}")
+
+    enums = [e for e in report['enums'] if (not e['referenced'] and not e['fields']) or e['unreferenced_values']]
+    if enums:
+        print("\n📊 Enums:")
+        for e in enums:
+            if not e['referenced'] and not e['fields']:
+                print(f"  ❌ {e['enum']}: not used by any model or code")
+            else:
+                print(f"  {e['enum']}: values never mentioned: {', '.join(e['unreferenced_values'])}")
+
+    indexed = [m for m in models if m['droppable_indexes']]
+    if indexed:
+        print(f"\n💡 Drop candidates ({totals['droppable_indexes']} of {totals['secondary_indexes']} secondary indexes):")
+        for m in indexed:
+            print(f"  {m['model']} ({len(m['droppable_indexes'])}/{m['secondary_indexes']}):")
+            for finding in m['droppable_indexes']:
+                print(f"    {finding['index']}  // {finding['reason']}")
+    else:
+        print("\n✅ Every secondary index is backed by code that can use it")
+
+
+# ======================
+# MAIN
+# ======================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Find models, fields, enums and indexes the backend never uses")
+    parser.add_argument('--schema', default=None, help="Path to schema.prisma (default: from config)")
+    parser.add_argument('--src', default=None, help="Backend source root (default: from config)")
+    parser.add_argument('--dir', action='append', dest='dirs', default=None,
+                        help=f"Directory under --src to scan (repeatable, default: {', '.join(SCAN_DIRS)})")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    tool_metrics.add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def analyse_usage(args):
+    config = load_config()
+    src_dir = args.src or config['backend_src_dir']
+    with tool_metrics.phase('parse'):
+        schema = load_schema(args.schema or config['schema_path'])
+        roles = build_roles(schema)
+    with tool_metrics.phase('walk'):
+        paths = list(source_files(src_dir, args.dirs or SCAN_DIRS))
+    if not paths:
+        print(f"❌ No source files under {src_dir} ({', '.join(args.dirs or SCAN_DIRS)})")
+        return 2
+    with tool_metrics.phase('read'):
+        models_usage, tokens = scan(paths, roles, src_dir)
+    with tool_metrics.phase('categorise'):
+        report = analyse(schema, models_usage, tokens)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tool_metrics.start_run('usage', args)
+    try:
+        return analyse_usage(args)
+    finally:
+        tool_metrics.finish_run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
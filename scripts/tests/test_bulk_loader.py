@@ -0,0 +1,47 @@
+from bulk_loader import copy_script, load_order, truncate_dependents
+from prisma_schema import parse_schema
+
+SCHEMA = """
+model Beta {
+  id      String @id
+  alphaId String
+  alpha   Alpha  @relation(fields: [alphaId], references: [id])
+}
+
+model Alpha {
+  id     String  @id
+  betaId String?
+  beta   Beta?   @relation(fields: [betaId], references: [id])
+}
+
+model Aaa {
+  id     String @id
+  betaId String
+  beta   Beta   @relation(fields: [betaId], references: [id])
+}
+"""
+
+
+def test_cycle_is_broken_inside_the_cycle():
+    order, cycles = load_order(['Aaa', 'Alpha', 'Beta'], parse_schema(SCHEMA))
+    # Aaa sorts first but only depends on the cycle; it must not be chosen to break it
+    assert cycles == [['Alpha', 'Beta']]
+    assert order == ['Alpha', 'Beta', 'Aaa']
+
+
+def test_load_is_one_transaction_with_a_single_truncate():
+    schema = parse_schema(SCHEMA)
+    models = [schema.models[name] for name in ('Alpha', 'Beta')]
+    normalised = {'Alpha': [{'id': 'a1', 'betaId': 'b1'}], 'Beta': [{'id': 'b1', 'alphaId': 'a1'}]}
+
+    script = ''.join(copy_script(models, normalised, schema, 100, truncate=True, replica=True))
+
+    assert script.startswith('BEGIN;\nSET LOCAL session_replication_role = replica;\nTRUNCATE "Alpha", "Beta";\n')
+    assert script.count('BEGIN;') == 1 and script.endswith('COMMIT;\n')
+
+
+def test_truncate_dependents_follow_foreign_keys_outside_the_loaded_tables():
+    foreign_keys = {('Aaa', 'Beta'), ('Beta', 'Alpha'), ('Zed', 'Aaa'), ('Alpha', 'Beta')}
+
+    assert truncate_dependents({'Alpha', 'Beta'}, foreign_keys) == ['Aaa', 'Zed']
+    assert truncate_dependents({'Zed'}, foreign_keys) == []
@@ -0,0 +1,40 @@
+from prisma_schema import parse_schema
+from query_log_analyser import analyse, predicate_clauses, query_shape
+
+SCHEMA = """
+model Drug {
+  id        String   @id @default(cuid())
+  name      String
+  hsnCode   String?
+  storeId   String
+  createdAt DateTime @default(now())
+
+  @@index([storeId])
+}
+"""
+
+
+def test_update_set_assignments_are_not_predicates():
+    sql = 'UPDATE "public"."Drug" SET "name" = ? WHERE "hsnCode" = ?'
+    shape = query_shape(sql, parse_schema(SCHEMA))['Drug']
+    assert shape['equality'] == ['hsnCode']
+
+    stats = {sql: {'fingerprint': sql, 'calls': 10, 'total_ms': 50.0}}
+    report = analyse(stats, parse_schema(SCHEMA), top=5)
+    assert [p['fields'] for p in report['proposals']] == [['hsnCode']]
+
+
+def test_join_on_and_where_predicates_are_kept():
+    sql = ('SELECT "t0"."id" FROM "public"."Drug" AS "t0" INNER JOIN "public"."Drug" AS "t1" '
+           'ON "t1"."id" = "t0"."storeId" WHERE "t0"."createdAt" >= ? ORDER BY "t0"."name" LIMIT ?')
+    assert len(predicate_clauses(sql)) == 2
+    shape = query_shape(sql, parse_schema(SCHEMA))['Drug']
+    assert shape['equality'] == ['id']
+    assert shape['range'] == ['createdAt']
+    assert shape['order'] == ['name']
+
+
+def test_select_list_comparison_is_ignored():
+    sql = 'SELECT "name" = ? AS "matches" FROM "public"."Drug" WHERE "storeId" = ?'
+    shape = query_shape(sql, parse_schema(SCHEMA))['Drug']
+    assert shape['equality'] == ['storeId']
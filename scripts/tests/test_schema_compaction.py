@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from prisma_schema import Field
+from schema_compaction import evaluate, retype
+
+OPTIONS = SimpleNamespace(max_enum_values=20, min_rows=2)
+
+
+def enum_candidate(name):
+    model = SimpleNamespace(name='Store', indexes=[])
+    return {'model': model, 'field': Field(name=name, type='String'), 'kind': 'enum', 'declared': []}
+
+
+def profile(values):
+    return {'rows': len(values), 'nulls': 0, 'bytes': sum(len(v) for v in values),
+            'distinct': set(values), 'overflow': False, 'missing': False}
+
+
+def test_enum_with_a_single_value_is_rejected():
+    result = evaluate(enum_candidate('rxNumberPrefix'), profile(['RX'] * 5), OPTIONS)
+
+    assert result['status'] == 'rejected'
+    assert result['saved_per_row'] == 0.0
+
+
+def test_enum_that_would_not_shrink_the_row_is_rejected():
+    result = evaluate(enum_candidate('mode'), profile(['ab', 'cd'] * 5), OPTIONS)
+
+    assert result['status'] == 'rejected'
+
+
+def test_enum_confirmed_when_it_saves_space():
+    result = evaluate(enum_candidate('mode'), profile(['webhook', 'polling'] * 5), OPTIONS)
+
+    assert result['status'] == 'confirmed'
+    assert result['values'] == ['polling', 'webhook']
+    assert result['saved_per_row'] > 0
+
+
+def test_retype_keeps_the_attribute_column():
+    line = '  whatsappMode   String?    @default("web") // web, api'
+
+    assert retype(line, 'whatsappMode', 'Mode?') == '  whatsappMode   Mode?      @default("web") // web, api'
+    assert retype(line, 'whatsappMode', 'StoreWhatsappMode?') == \
+        '  whatsappMode   StoreWhatsappMode? @default("web") // web, api'
+    assert retype('  images Json?', 'images', 'StoreImage[]') == '  images StoreImage[]'
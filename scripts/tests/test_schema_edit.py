@@ -0,0 +1,84 @@
+import pytest
+
+from prisma_schema import split_blocks
+from schema_edit import (
+    SchemaMergeConflict,
+    add_blocks,
+    commit_schema,
+    merge_schema,
+    remove_blocks,
+)
+
+BASE = """generator client {
+  provider = "prisma-client-js"
+}
+
+datasource db {
+  provider = "postgresql"
+  url      = env("DATABASE_URL")
+}
+
+// Drugs sold by a store
+model Drug {
+  id   String @id
+  name String
+}
+
+model Sale {
+  id    String @id
+  total Float
+}
+"""
+
+
+def block_names(text):
+    return [block.name for block in split_blocks(text)]
+
+
+def test_disjoint_edits_are_merged():
+    ours = BASE.replace('  name String\n', '  name String\n  hsnCode String?\n')
+    theirs = add_blocks(BASE, 'model Refill {\n  id String @id\n}\n')[0]
+
+    merged = merge_schema(BASE, ours, theirs)
+
+    assert 'hsnCode String?' in merged
+    assert block_names(merged) == ['client', 'db', 'Drug', 'Sale', 'Refill']
+    assert merged.endswith('}\n')
+
+
+def test_same_block_changed_on_both_sides_conflicts():
+    ours = BASE.replace('  total Float\n', '  total Decimal\n')
+    theirs = BASE.replace('  total Float\n', '  total Int\n')
+
+    with pytest.raises(SchemaMergeConflict) as conflict:
+        merge_schema(BASE, ours, theirs)
+    assert conflict.value.keys == [('model', 'Sale', 0)]
+
+
+def test_block_added_after_a_concurrently_removed_anchor_goes_to_the_end():
+    ours = add_blocks(BASE, 'model Refill {\n  id String @id\n}\n', after=('model', 'Drug'))[0]
+    theirs = remove_blocks(BASE, 'model', 'Drug')[0]
+
+    merged = merge_schema(BASE, ours, theirs)
+
+    assert block_names(merged) == ['client', 'db', 'Sale', 'Refill']
+
+
+def test_remove_blocks_takes_leading_comments_with_it():
+    text, removed = remove_blocks(BASE, 'model', 'Drug')
+
+    assert removed == [11]
+    assert 'Drugs sold by a store' not in text
+    assert block_names(text) == ['client', 'db', 'Sale']
+
+
+def test_commit_merges_when_the_file_changed_since_it_was_read(tmp_path):
+    path = tmp_path / 'schema.prisma'
+    path.write_text(BASE)
+    ours = add_blocks(BASE, 'model Refill {\n  id String @id\n}\n')[0]
+    path.write_text(BASE.replace('  total Float\n', '  total Decimal\n'))
+
+    assert commit_schema(str(path), BASE, ours) == 'merged'
+    merged = path.read_text()
+    assert 'total Decimal' in merged
+    assert block_names(merged)[-1] == 'Refill'
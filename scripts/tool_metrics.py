@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tooling Metrics
+Per-phase timing and file/directory counts for the Python tooling, emitted as
+JSON lines or a summary table, with opt-in tracemalloc peaks and cProfile dump.
+
+Scripts wrap their work in phase() blocks and call count(); both are no-ops
+unless a run was started with --metrics/--metrics-file/--profile (or HOPERX_METRICS
+is set). tracemalloc hooks every allocation and can slow allocation-heavy phases
+several times over, so --metrics-memory is separate from --metrics and its timings
+should not be compared with runs that leave it off.
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+METRIC_FORMATS = ['table', 'jsonl']
+
+_active_run = None
+
+
+class MetricsRun:
+    """One tool invocation: an ordered list of phases plus run totals"""
+
+    def __init__(self, tool, profile_dir=None, trace_memory=False):
+        self.tool = tool
+        self.run_id = datetime.now().strftime('%Y%m%dT%H%M%S') + f"-{os.getpid()}"
+        self.phases = []
+        self.current = None
+        self.started = time.perf_counter()
+        self.profile_dir = profile_dir
+        self.profiler = None
+        self.trace_memory = trace_memory
+        # Peak floors of the open phases, raised as nested phases close
+        self.peak_floors = []
+
+        if trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if profile_dir:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    @contextmanager
+    def phase(self, name):
+        parent = self.current
+        record = {'phase': name, 'seconds': 0.0, 'peak_bytes': None, 'counts': {}}
+        self.current = record
+        if self.trace_memory:
+            import tracemalloc
+            # reset_peak() is global: keep the enclosing phase's peak so far to restore it afterwards
+            enclosing_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            self.peak_floors.append(0)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = round(time.perf_counter() - start, 6)
+            if self.trace_memory:
+                record['peak_bytes'] = max(self.peak_floors.pop(), tracemalloc.get_traced_memory()[1])
+                if self.peak_floors:
+                    self.peak_floors[-1] = max(self.peak_floors[-1], enclosing_peak, record['peak_bytes'])
+            self.phases.append(record)
+            self.current = parent
+
+    def count(self, name, amount=1):
+        if self.current is not None:
+            counts = self.current['counts']
+            counts[name] = counts.get(name, 0) + amount
+
+    def finish(self):
+        total = {
+            'phase': 'total',
+            'seconds': round(time.perf_counter() - self.started, 6),
+            'peak_bytes': None,
+            'counts': {},
+        }
+        for record in self.phases:
+            for name, amount in record['counts'].items():
+                total['counts'][name] = total['counts'].get(name, 0) + amount
+        if self.trace_memory:
+            import tracemalloc
+            total['peak_bytes'] = max([p['peak_bytes'] for p in self.phases] + [tracemalloc.get_traced_memory()[1]])
+            tracemalloc.stop()
+
+        profile_path = None
+        if self.profiler:
+            self.profiler.disable()
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profile_path = os.path.join(self.profile_dir, f"{self.tool}-{self.run_id}.prof")
+            self.profiler.dump_stats(profile_path)
+
+        return self.phases + [total], profile_path
+
+
+def add_metrics_arguments(parser):
+    """Shared --metrics/--metrics-file/--metrics-memory/--profile options"""
+    parser.add_argument('--metrics', choices=METRIC_FORMATS, default=os.environ.get('HOPERX_METRICS'),
+                        help="Emit per-phase timing and counts (default: $HOPERX_METRICS)")
+    parser.add_argument('--metrics-file', default=os.environ.get('HOPERX_METRICS_FILE'),
+                        help="Append metrics here instead of stderr, as JSON lines unless --metrics says "
+                             "otherwise (default: $HOPERX_METRICS_FILE)")
+    parser.add_argument('--metrics-memory', action='store_true', default=bool(os.environ.get('HOPERX_METRICS_MEMORY')),
+                        help="Also record tracemalloc peaks per phase; slows allocation-heavy phases "
+                             "(default: $HOPERX_METRICS_MEMORY)")
+    parser.add_argument('--profile', metavar='DIR', default=os.environ.get('HOPERX_PROFILE_DIR'),
+                        help="Write a cProfile dump for this run into DIR (default: $HOPERX_PROFILE_DIR)")
+
+
+def metrics_format(args):
+    """Requested output format; a metrics file on its own means JSON lines"""
+    if args.metrics:
+        return args.metrics
+    return 'jsonl' if args.metrics_file else None
+
+
+def start_run(tool, args):
+    """Start collecting if the parsed args ask for metrics or a profile"""
+    global _active_run
+    if metrics_format(args) or args.profile:
+        _active_run = MetricsRun(tool, profile_dir=args.profile, trace_memory=args.metrics_memory)
+    return _active_run
+
+
+def finish_run(args):
+    """Stop collecting and emit the run in the requested format"""
+    global _active_run
+    run, _active_run = _active_run, None
+    if run is None:
+        return
+
+    records, profile_path = run.finish()
+    output_format = metrics_format(args)
+    lines = format_jsonl(run, records) if output_format == 'jsonl' else format_table(run, records)
+    if profile_path:
+        lines.append(f"# cProfile dump: {profile_path}")
+
+    if not output_format and not profile_path:
+        return
+    if args.metrics_file:
+        with open(args.metrics_file, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+    else:
+        print('\n'.join(lines), file=sys.stderr)
+
+
+@contextmanager
+def phase(name):
+    """Time a phase of the active run (no-op when metrics are off)"""
+    if _active_run is None:
+        yield None
+        return
+    with _active_run.phase(name) as record:
+        yield record
+
+
+def count(name, amount=1):
+    """Add to a counter on the current phase (no-op when metrics are off)"""
+    if _active_run is not None:
+        _active_run.count(name, amount)
+
+
+def format_jsonl(run, records):
+    return [
+        json.dumps({'tool': run.tool, 'run_id': run.run_id, **record}, sort_keys=True)
+        for record in records
+    ]
+
+
+def format_table(run, records):
+    lines = [
+        f"📈 {run.tool} ({run.run_id})",
+        f"{'phase':<14}{'seconds':>10}{'peak KiB':>12}  counts",
+    ]
+    for record in records:
+        counts = ', '.join(f"{k}={v}" for k, v in sorted(record['counts'].items()))
+        peak = '-' if record['peak_bytes'] is None else f"{record['peak_bytes'] / 1024:.1f}"
+        lines.append(f"{record['phase']:<14}{record['seconds']:>10.4f}{peak:>12}  {counts}")
+    return lines
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tooling Configuration
+Resolves the paths used by the Python tooling from environment variables,
+an optional hoperx-tools.json at the repo root, and repo-relative defaults
+(in that order of precedence)
+"""
+
+import json
+import os
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+CONFIG_FILE_NAME = 'hoperx-tools.json'
+
+# Config key -> (environment variable, default relative to the repo root)
+PATH_SETTINGS = {
+    'app_dir': ('HOPERX_APP_DIR', 'app'),
+    'schema_path': ('HOPERX_SCHEMA_PATH', 'backend/prisma/schema.prisma'),
+    'backend_src_dir': ('HOPERX_BACKEND_SRC_DIR', 'backend/src'),
+    'business_types_path': ('HOPERX_BUSINESS_TYPES_PATH', 'backend/prisma/seeds/businessTypeConfigs.js'),
+    'route_tracker_path': ('HOPERX_ROUTE_TRACKER_PATH', 'Route_Verification_Tracker.csv'),
+    'master_tracker_path': ('HOPERX_MASTER_TRACKER_PATH', 'Master_Feature_Verification_System.xlsx'),
+    'bench_baseline_path': ('HOPERX_BENCH_BASELINE_PATH', 'scripts/benchmarks/baseline.json'),
+    'tracker_history_dir': ('HOPERX_TRACKER_HISTORY_DIR', 'tracker_history'),
+    'index_bench_queries_path': ('HOPERX_INDEX_BENCH_QUERIES_PATH', 'scripts/index_bench_queries.json'),
+}
+
+# Config key -> (environment variable, default)
+VALUE_SETTINGS = {
+    'startup_budget_ms': ('HOPERX_STARTUP_BUDGET_MS', 150),
+    'pg_bin_dir': ('HOPERX_PG_BIN_DIR', ''),
+    'pg_image': ('HOPERX_PG_IMAGE', 'postgres:16'),
+    'database_url': ('HOPERX_DATABASE_URL', ''),
+}
+
+
+def lookup(key, env_var, default, file_settings, config_path):
+    """(value, source) for one setting; a variable or key that is set wins even when empty or falsy"""
+    if env_var in os.environ:
+        return os.environ[env_var], env_var
+    if file_settings.get(key) is not None:
+        return file_settings[key], f"'{key}' in {config_path}"
+    return default, 'default'
+
+
+def load_config(config_path=None):
+    """Load tooling settings as a dict of absolute paths and values"""
+    root = Path(os.environ.get('HOPERX_ROOT', REPO_ROOT)).resolve()
+
+    config_path = config_path or os.environ.get('HOPERX_TOOLS_CONFIG') or root / CONFIG_FILE_NAME
+    file_settings = {}
+    if Path(config_path).is_file():
+        with open(config_path, 'r', encoding='utf-8') as f:
+            file_settings = json.load(f)
+
+    config = {'root': str(root)}
+    for key, (env_var, default) in PATH_SETTINGS.items():
+        value, _ = lookup(key, env_var, default, file_settings, config_path)
+        config[key] = str((root / value).resolve())
+
+    for key, (env_var, default) in VALUE_SETTINGS.items():
+        value, source = lookup(key, env_var, default, file_settings, config_path)
+        try:
+            config[key] = type(default)(value)
+        except (TypeError, ValueError):
+            raise SystemExit(f"❌ {source} must be {type(default).__name__}, got {value!r}")
+
+    return config
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Tracker History
+Appends a snapshot of the filled-in route tracker CSV and master workbook to a columnar
+history before the generators overwrite them, keyed by release and UTC timestamp. Those
+snapshots hold the state reached *before* that release's trackers were generated, so they
+are labelled pre-<release>; `history snapshot` records the current state as <release>.
+
+Snapshots are Parquet files when pyarrow is installed, otherwise gzipped CSV chunks whose
+category/status/verification columns hold integer codes from a shared dictionary. The
+trends query streams one snapshot at a time, so hundreds of releases stay cheap to scan.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+
+from tools_config import load_config
+import tool_metrics
+
+HISTORY_SOURCES = ['routes', 'workbook']
+SNAPSHOT_COLUMNS = ['variant', 'key', 'category', 'status', 'dev', 'tester', 'bugs']
+DICTIONARY_COLUMNS = ['variant', 'category', 'status', 'dev', 'tester']
+GROUP_COLUMNS = ['variant', 'category', 'status']
+DEFAULT_VARIANT = 'All'
+MANIFEST_NAME = 'manifest.jsonl'
+DICTIONARY_NAME = 'dictionaries.json'
+TIMESTAMP_FORMAT = '%Y%m%dT%H%M%SZ'
+
+# Tracker cell -> normalised verification state (CSV uses ✓/-, the workbook its Verification Status list)
+VERIFICATION_LABELS = {
+    '✓': 'pass', '✔': 'pass', '✅ pass': 'pass', 'pass': 'pass', 'yes': 'pass', 'y': 'pass',
+    '-': 'partial', '⏸ partial': 'partial', 'partial': 'partial', 'in progress': 'partial',
+    '✗': 'fail', '❌ fail': 'fail', 'fail': 'fail', 'no': 'fail',
+    '— not tested': '', 'not tested': '',
+}
+OPEN_BUG_STATUSES = {'Open', 'In Progress'}
+BUG_SPLIT_PATTERN = re.compile(r'[;\n]+')
+FEATURE_ID_PATTERN = re.compile(r'\bF(?:EAT)?-?\d+\b')
+
+
+# ======================
+# READING TRACKERS
+# ======================
+
+def normalise_verification(value):
+    text = str(value or '').strip()
+    return VERIFICATION_LABELS.get(text.lower(), text.lower())
+
+
+def bug_count(value):
+    """A number, or one bug per ';'/line-separated entry"""
+    text = str(value or '').strip()
+    if text.isdigit():
+        return int(text)
+    return len([item for item in BUG_SPLIT_PATTERN.split(text) if item.strip()])
+
+
+def read_route_tracker(path, variant):
+    import csv
+
+    rows = []
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for record in csv.DictReader(f):
+            rows.append({
+                'variant': variant,
+                'key': record.get('Route/Path', ''),
+                'category': record.get('Feature Category', ''),
+                'status': (record.get('Status') or '').strip(),
+                'dev': normalise_verification(record.get('Dev Verified')),
+                'tester': normalise_verification(record.get('Tester Verified')),
+                'bugs': bug_count(record.get('Bugs')),
+            })
+    return rows
+
+
+def sheet_records(workbook, title):
+    """Rows of a sheet as dicts keyed by its header row (blank rows skipped)"""
+    if title not in workbook.sheetnames:
+        return
+    rows = workbook[title].iter_rows(values_only=True)
+    header = [str(h or '') for h in next(rows, [])]
+    for values in rows:
+        if any(v not in (None, '') for v in values):
+            yield dict(zip(header, values))
+
+
+def read_workbook_tracker(path, variant):
+    """Feature Master rows joined with their latest verification and open bug count"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        verification = {}
+        for record in sheet_records(workbook, 'Verification Checklist'):
+            verification[str(record.get('Feature ID') or '')] = record
+
+        open_bugs = {}
+        for record in sheet_records(workbook, 'Bug Tracker'):
+            if str(record.get('Status') or 'Open') in OPEN_BUG_STATUSES:
+                for feature_id in FEATURE_ID_PATTERN.findall(str(record.get('Related Feature ID(s)') or '')):
+                    open_bugs[feature_id] = open_bugs.get(feature_id, 0) + 1
+
+        rows = []
+        for record in sheet_records(workbook, 'Feature Master'):
+            feature_id = str(record.get('Feature ID') or '')
+            checks = verification.get(feature_id, {})
+            rows.append({
+                'variant': variant,
+                'key': feature_id,
+                'category': str(record.get('Module') or ''),
+                'status': str(record.get('Status') or ''),
+                'dev': normalise_verification(checks.get('Dev Verified')),
+                'tester': normalise_verification(checks.get('Tester Verified')),
+                'bugs': open_bugs.get(feature_id, 0),
+            })
+        return rows
+    finally:
+        workbook.close()
+
+
+TRACKER_READERS = {'routes': read_route_tracker, 'workbook': read_workbook_tracker}
+
+
+def default_release(root):
+    """Version from the root package.json"""
+    try:
+        with open(os.path.join(root, 'package.json'), 'r', encoding='utf-8') as f:
+            return json.load(f).get('version') or 'unreleased'
+    except (OSError, ValueError):
+        return 'unreleased'
+
+
+# ======================
+# WRITING SNAPSHOTS
+# ======================
+
+def parquet_available():
+    import importlib.util
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def slug(text):
+    return re.sub(r'[^\w.-]+', '-', text).strip('-') or 'none'
+
+
+def load_dictionaries(history_dir):
+    path = os.path.join(history_dir, DICTIONARY_NAME)
+    if not os.path.exists(path):
+        return {column: [] for column in DICTIONARY_COLUMNS}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_dictionaries(history_dir, dictionaries):
+    """Codes are append-only, so chunks written earlier always decode the same way"""
+    path = os.path.join(history_dir, DICTIONARY_NAME)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(dictionaries, f, ensure_ascii=False, indent=1)
+    os.replace(path + '.tmp', path)
+
+
+def write_csv_chunk(path, rows, history_dir):
+    import csv
+
+    dictionaries = load_dictionaries(history_dir)
+    lookups = {column: {value: code for code, value in enumerate(dictionaries[column])}
+               for column in DICTIONARY_COLUMNS}
+
+    def encode(column, value):
+        if value not in lookups[column]:
+            lookups[column][value] = len(dictionaries[column])
+            dictionaries[column].append(value)
+        return lookups[column][value]
+
+    with gzip.open(path, 'wt', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(SNAPSHOT_COLUMNS)
+        for row in rows:
+            writer.writerow([encode(c, row[c]) if c in DICTIONARY_COLUMNS else row[c] for c in SNAPSHOT_COLUMNS])
+    save_dictionaries(history_dir, dictionaries)
+
+
+def write_parquet_chunk(path, rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = {}
+    for column in SNAPSHOT_COLUMNS:
+        array = pa.array([row[column] for row in rows], type=pa.int32() if column == 'bugs' else pa.string())
+        columns[column] = array.dictionary_encode() if column in DICTIONARY_COLUMNS else array
+    pq.write_table(pa.table(columns), path, compression='zstd')
+
+
+def release_label(entry):
+    """'pre-1.2.0' for state captured before 1.2.0's trackers were generated, else the release"""
+    return f"pre-{entry['release']}" if entry.get('stage') == 'pre-release' else entry['release']
+
+
+def write_snapshot(history_dir, source, release, variant, rows, taken=None, stage='current'):
+    """Write one snapshot chunk and record it in the manifest"""
+    taken = taken or datetime.now(timezone.utc)
+    timestamp = taken.strftime(TIMESTAMP_FORMAT)
+    source_dir = os.path.join(history_dir, source)
+    os.makedirs(source_dir, exist_ok=True)
+
+    use_parquet = parquet_available()
+    stem = f"{timestamp}_{slug(release_label({'release': release, 'stage': stage}))}_{slug(variant)}"
+    extension = '.parquet' if use_parquet else '.csv.gz'
+    name, attempt = stem + extension, 1
+    while os.path.exists(os.path.join(source_dir, name)):
+        attempt += 1
+        name = f"{stem}-{attempt}{extension}"
+    path = os.path.join(source_dir, name)
+    if use_parquet:
+        write_parquet_chunk(path, rows)
+    else:
+        write_csv_chunk(path, rows, history_dir)
+
+    entry = {
+        'release': release, 'stage': stage, 'timestamp': timestamp, 'source': source, 'variant': variant,
+        'file': os.path.join(source, name), 'format': 'parquet' if use_parquet else 'csv.gz', 'rows': len(rows),
+    }
+    with open(os.path.join(history_dir, MANIFEST_NAME), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    return entry
+
+
+def snapshot_outputs(source, outputs, release, history_dir, stage='current'):
+    """Snapshot each (variant, tracker path) that exists"""
+    entries = []
+    for variant, path in outputs:
+        if not os.path.exists(path):
+            continue
+        rows = TRACKER_READERS[source](path, variant)
+        if not rows:
+            continue
+        entries.append(write_snapshot(history_dir, source, release, variant, rows, stage=stage))
+        tool_metrics.count('snapshots')
+        tool_metrics.count('snapshot_rows', len(rows))
+        print(f"🗂️  Snapshot {release_label(entries[-1])} {variant}: {len(rows)} rows -> {entries[-1]['file']}")
+    return entries
+
+
+def add_snapshot_arguments(parser):
+    parser.add_argument('--release', default=None,
+                        help="Release being generated; the overwritten trackers are recorded as pre-<release> "
+                             "(default: HOPERX_RELEASE or package.json version)")
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help="Overwrite trackers without recording them in the history first")
+
+
+def snapshot_before_write(args, source, outputs, config):
+    """Generator hook: record the trackers about to be overwritten, as the state before this release"""
+    if args.no_snapshot:
+        return []
+    release = args.release or os.environ.get('HOPERX_RELEASE') or default_release(config['root'])
+    with tool_metrics.phase('snapshot'):
+        return snapshot_outputs(source, outputs, release, config['tracker_history_dir'], stage='pre-release')
+
+
+# ======================
+# QUERYING
+# ======================
+
+def read_manifest(history_dir, source=None, variant=None):
+    path = os.path.join(history_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if (source is None or entry['source'] == source) and (variant is None or entry['variant'] == variant):
+                yield entry
+
+
+def iter_snapshot_rows(history_dir, entry, dictionaries):
+    """Decoded rows of one snapshot; only that snapshot is ever held in memory"""
+    path = os.path.join(history_dir, entry['file'])
+    if entry['format'] == 'parquet':
+        import pyarrow.parquet as pq
+        yield from pq.read_table(path, columns=SNAPSHOT_COLUMNS).to_pylist()
+        return
+
+    import csv
+    with gzip.open(path, 'rt', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        for values in reader:
+            row = dict(zip(header, values))
+            for column in DICTIONARY_COLUMNS:
+                row[column] = dictionaries[column][int(row[column])]
+            row['bugs'] = int(row['bugs'])
+            yield row
+
+
+def new_summary():
+    return {'rows': 0, 'dev_pass': 0, 'tester_pass': 0, 'verified': 0, 'failed': 0, 'bugs': 0}
+
+
+def summarise(rows, group_by=None):
+    """Group value (None when ungrouped) -> verification and bug counts"""
+    summaries = {}
+    for row in rows:
+        summary = summaries.setdefault(row[group_by] if group_by else None, new_summary())
+        summary['rows'] += 1
+        summary['dev_pass'] += row['dev'] == 'pass'
+        summary['tester_pass'] += row['tester'] == 'pass'
+        summary['verified'] += row['dev'] == 'pass' and row['tester'] == 'pass'
+        summary['failed'] += 'fail' in (row['dev'], row['tester'])
+        summary['bugs'] += row['bugs']
+    return summaries
+
+
+def trends(history_dir, source, variant=None, group_by=None, last=None):
+    """One record per snapshot (and group), oldest first"""
+    entries = sorted(read_manifest(history_dir, source, variant), key=lambda e: e['timestamp'])
+    if last:
+        entries = entries[-last:]
+    dictionaries = load_dictionaries(history_dir)
+
+    records = []
+    for entry in entries:
+        tool_metrics.count('snapshots')
+        summaries = summarise(iter_snapshot_rows(history_dir, entry, dictionaries), group_by)
+        for group, summary in sorted(summaries.items(), key=lambda item: str(item[0])):
+            record = {'release': release_label(entry), 'stage': entry.get('stage', 'current'), 'timestamp': entry['timestamp'], 'variant': entry['variant'],
+                      'file': entry['file']}
+            if group_by:
+                record[group_by] = group
+            records.append({**record, **summary})
+    return records
+
+
+def print_trends(records, source, group_by):
+    if not records:
+        print(f"ℹ️  No {source} snapshots recorded yet")
+        return
+    group_header = f"{group_by:<22}" if group_by else ''
+    print(f"📈 {source} history ({len({r['file'] for r in records})} snapshots)")
+    print(f"{'release':<12}{'taken (UTC)':<18}{'variant':<20}{group_header}"
+          f"{'rows':>6}{'dev ✓':>7}{'test ✓':>8}{'verified':>10}{'failed':>8}{'bugs':>6}{'Δbugs':>7}")
+
+    previous = {}
+    for r in records:
+        key = (r['variant'], r.get(group_by))
+        delta = r['bugs'] - previous[key] if key in previous else None
+        previous[key] = r['bugs']
+        taken = datetime.strptime(r['timestamp'], TIMESTAMP_FORMAT).strftime('%Y-%m-%d %H:%M')
+        group = f"{str(r[group_by])[:21]:<22}" if group_by else ''
+        verified = f"{100 * r['verified'] / r['rows']:.1f}%" if r['rows'] else '-'
+        print(f"{r['release'][:11]:<12}{taken:<18}{r['variant'][:19]:<20}{group}"
+              f"{r['rows']:>6}{r['dev_pass']:>7}{r['tester_pass']:>8}{verified:>10}{r['failed']:>8}{r['bugs']:>6}"
+              f"{'' if delta is None else f'{delta:+d}':>7}")
+
+
+# ======================
+# MAIN
+# ======================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Snapshot tracker state per release and query its trends")
+    parser.add_argument('--history-dir', default=None, help="History directory (default: from config)")
+    actions = parser.add_subparsers(dest='action', required=True)
+
+    snapshot = actions.add_parser('snapshot', help="Append the current trackers to the history")
+    snapshot.add_argument('--source', choices=HISTORY_SOURCES + ['all'], default='all')
+    snapshot.add_argument('--release', default=None,
+                          help="Release label (default: HOPERX_RELEASE or package.json version)")
+    tool_metrics.add_metrics_arguments(snapshot)
+
+    trend = actions.add_parser('trends', help="Verification and bug trends across snapshots")
+    trend.add_argument('--source', choices=HISTORY_SOURCES, default='routes')
+    trend.add_argument('--variant', default=None, help="Only this business type (default: every variant)")
+    trend.add_argument('--by', choices=GROUP_COLUMNS, default=None, help="Break each snapshot down by a column")
+    trend.add_argument('--last', type=int, default=None, help="Only the most recent N snapshots")
+    trend.add_argument('--json', action='store_true', help="Print the records as JSON")
+    tool_metrics.add_metrics_arguments(trend)
+
+    listing = actions.add_parser('list', help="List recorded snapshots")
+    listing.add_argument('--source', choices=HISTORY_SOURCES, default=None)
+    tool_metrics.add_metrics_arguments(listing)
+    return parser.parse_args(argv)
+
+
+def run_history(args):
+    config = load_config()
+    history_dir = args.history_dir or config['tracker_history_dir']
+
+    if args.action == 'snapshot':
+        release = args.release or os.environ.get('HOPERX_RELEASE') or default_release(config['root'])
+        sources = HISTORY_SOURCES if args.source == 'all' else [args.source]
+        paths = {'routes': config['route_tracker_path'], 'workbook': config['master_tracker_path']}
+        entries = []
+        with tool_metrics.phase('snapshot'):
+            for source in sources:
+                entries += snapshot_outputs(source, [(DEFAULT_VARIANT, paths[source])], release, history_dir)
+        if not entries:
+            print("ℹ️  No tracker files to snapshot")
+        return 0
+
+    if args.action == 'list':
+        with tool_metrics.phase('read'):
+            for entry in read_manifest(history_dir, args.source):
+                print(f"{entry['timestamp']}  {release_label(entry):<12} {entry['source']:<9} "
+                      f"{entry['variant']:<20} {entry['rows']:>6} rows  {entry['file']}")
+        return 0
+
+    with tool_metrics.phase('read'):
+        records = trends(history_dir, args.source, args.variant, args.by, args.last)
+    if args.json:
+        print(json.dumps(records, indent=2, ensure_ascii=False))
+    else:
+        print_trends(records, args.source, args.by)
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tool_metrics.start_run('history', args)
+    try:
+        return run_history(args)
+    finally:
+        tool_metrics.finish_run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())